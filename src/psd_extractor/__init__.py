@@ -9,10 +9,14 @@ __version__ = "0.1.0"
 __author__ = "PSD Character Extractor Contributors"
 __email__ = "contact@example.com"
 
-from .analyzer import PSDAnalyzer
-from .batch import BatchProcessor
-from .extractor import CharacterExtractor
-from .optimizer import ImageOptimizer
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .analyzer import PSDAnalyzer
+    from .batch import BatchProcessor
+    from .extractor import CharacterExtractor
+    from .optimizer import ImageOptimizer
 
 __all__ = [
     "CharacterExtractor",
@@ -20,3 +24,22 @@ __all__ = [
     "ImageOptimizer",
     "BatchProcessor",
 ]
+
+# Public classes are imported on first access, so lightweight entry points
+# (such as the CLI) don't pay for psd-tools, PIL and numpy up front
+_LAZY_EXPORTS = {
+    "CharacterExtractor": ".extractor",
+    "PSDAnalyzer": ".analyzer",
+    "ImageOptimizer": ".optimizer",
+    "BatchProcessor": ".batch",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public classes lazily on first access."""
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -16,16 +16,20 @@ logger = logging.getLogger(__name__)
 class PSDAnalyzer:
     """Analyzes PSD file structure and identifies expression layers."""
 
-    def __init__(self, psd_path: str):
+    def __init__(self, psd_path: str, psd: Optional[PSDImage] = None):
         """
         Initialize analyzer with PSD file.
 
         Args:
             psd_path: Path to the PSD file to analyze
+            psd: Already opened PSD to analyze instead of reopening psd_path
         """
         self.psd_path = psd_path
-        self.psd = None
-        self._load_psd()
+        self.psd = psd
+        self._layer_index: Optional[Dict[str, any]] = None
+        self._expression_matches: Optional[List[Tuple[any, List[str]]]] = None
+        if self.psd is None:
+            self._load_psd()
 
     def _load_psd(self) -> None:
         """Load PSD file and validate it."""
@@ -150,42 +154,49 @@ class PSDAnalyzer:
             "laugh",
         ]
 
+        if self._expression_matches is None:
+            # Layer names don't change after loading, so the keyword scan over
+            # the whole tree is only done once
+            self._expression_matches = []
+            for layer in self.psd.descendants():
+                layer_name_lower = layer.name.lower()
+
+                # Check if layer name contains expression keywords
+                matched_keywords = [
+                    kw for kw in expression_keywords if kw in layer_name_lower
+                ]
+
+                if matched_keywords:
+                    self._expression_matches.append((layer, matched_keywords))
+
         potential_expressions = []
-        all_layers = list(self.psd.descendants())
 
-        for layer in all_layers:
-            layer_name_lower = layer.name.lower()
+        # Visibility and bounds can change, so they are read on every call
+        for layer, matched_keywords in self._expression_matches:
+            layer_info = {
+                "name": layer.name,
+                "keywords": list(matched_keywords),
+                "visible": layer.visible,
+                "layer_object": layer,
+            }
 
-            # Check if layer name contains expression keywords
-            matched_keywords = [
-                kw for kw in expression_keywords if kw in layer_name_lower
-            ]
-
-            if matched_keywords:
-                layer_info = {
-                    "name": layer.name,
-                    "keywords": matched_keywords,
-                    "visible": layer.visible,
-                    "layer_object": layer,
-                }
-
-                # Add dimension info if available
-                if hasattr(layer, "bbox"):
-                    try:
-                        bbox = layer.bbox
-                        if bbox:
-                            layer_info.update(
-                                {
-                                    "width": bbox[2] - bbox[0],
-                                    "height": bbox[3] - bbox[1],
-                                    "x": bbox[0],
-                                    "y": bbox[1],
-                                }
-                            )
-                    except Exception:
-                        pass
-
-                potential_expressions.append(layer_info)
+            # Add dimension info if available
+            if hasattr(layer, "bbox"):
+                try:
+                    bbox = layer.bbox
+                    if bbox:
+                        layer_info.update(
+                            {
+                                "width": bbox[2] - bbox[0],
+                                "height": bbox[3] - bbox[1],
+                                "x": bbox[0],
+                                "y": bbox[1],
+                            }
+                        )
+                except Exception:
+                    pass
+
+            potential_expressions.append(layer_info)
 
         return potential_expressions
 
@@ -317,10 +328,14 @@ class PSDAnalyzer:
         if not self.psd:
             raise ValueError("PSD file not loaded")
 
-        for layer in self.psd.descendants():
-            if layer.name == layer_name:
-                return layer
-        return None
+        if self._layer_index is None:
+            # Index the tree once; the first layer with a given name wins,
+            # matching a depth-first search
+            self._layer_index = {}
+            for layer in self.psd.descendants():
+                self._layer_index.setdefault(layer.name, layer)
+
+        return self._layer_index.get(layer_name)
 
     def get_expression_group(self) -> Optional[any]:
         """
@@ -338,10 +353,16 @@ class PSDAnalyzer:
 
         return None
 
-    def get_extractable_components(self) -> List[Dict[str, any]]:
+    def get_extractable_components(
+        self, all_components: Optional[Dict[str, List[Dict[str, any]]]] = None
+    ) -> List[Dict[str, any]]:
         """
         Get all components that can be individually extracted.
 
+        Args:
+            all_components: Result of find_all_components() to reuse instead
+                of categorizing the layer tree again
+
         Returns:
             List of component dictionaries with extraction metadata
         """
@@ -349,7 +370,8 @@ class PSDAnalyzer:
             raise ValueError("PSD file not loaded")
 
         extractable = []
-        all_components = self.find_all_components()
+        if all_components is None:
+            all_components = self.find_all_components()
 
         for category, components in all_components.items():
             for component in components:
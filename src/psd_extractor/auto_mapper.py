@@ -6,6 +6,7 @@ Maps PSD layers to avatar slots using configurable rules and heuristics.
 
 import logging
 import re
+from collections import defaultdict
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -297,19 +298,13 @@ class AutoMapper:
         self, layers: List[LayerInfo]
     ) -> Dict[str, List[LayerInfo]]:
         """Group layers by their target slot."""
-        slot_groups = {}
+        slot_groups: Dict[str, List[LayerInfo]] = defaultdict(list)
 
         for layer in layers:
-            if not layer.pcs_tag:
-                continue
-
-            slot_key = layer.pcs_tag.to_slot_key()
-            if slot_key not in slot_groups:
-                slot_groups[slot_key] = []
-
-            slot_groups[slot_key].append(layer)
+            if layer.pcs_tag:
+                slot_groups[layer.pcs_tag.to_slot_key()].append(layer)
 
-        return slot_groups
+        return dict(slot_groups)
 
     def _build_slot_definitions(
         self, slot_groups: Dict[str, List[LayerInfo]]
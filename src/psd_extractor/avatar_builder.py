@@ -8,8 +8,9 @@ import json
 import logging
 import math
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 from PIL import Image
 from psd_tools import PSDImage
 
@@ -271,14 +272,20 @@ class AvatarBuilder:
         # Simple bin packing algorithm
         atlas_width, atlas_height, slice_rects = self._simple_bin_pack(sorted_items)
 
-        # Create atlas image
-        atlas = Image.new("RGBA", (atlas_width, atlas_height), (0, 0, 0, 0))
+        # Compose atlas as a single RGBA array; slices never overlap, so each
+        # one is a straight strided copy rather than an alpha-blended paste
+        atlas_array = np.zeros((atlas_height, atlas_width, 4), dtype=np.uint8)
 
-        # Paste images into atlas
         for key, image in images.items():
             if key in slice_rects:
                 rect = slice_rects[key]
-                atlas.paste(image, (rect.x, rect.y), image)
+                if image.mode != "RGBA":
+                    image = image.convert("RGBA")
+                atlas_array[rect.y : rect.y + rect.h, rect.x : rect.x + rect.w] = (
+                    np.asarray(image)
+                )
+
+        atlas = Image.fromarray(atlas_array, "RGBA")
 
         logger.info(
             f"Created atlas: {atlas_width}x{atlas_height} with {len(slice_rects)} slices"
@@ -400,40 +407,46 @@ class AvatarBuilder:
         self, report: Dict[str, Any], avatar: AvatarBundle
     ) -> str:
         """Generate markdown content for the mapping report."""
-        md_lines = [
-            "# Avatar Mapping Report",
-            "",
-            "## Summary",
-            f"- Total layers: {report['summary']['total_layers']}",
-            f"- Mapped layers: {report['summary']['mapped_layers']}",
-            f"- Unmapped layers: {report['summary']['unmapped_layers']}",
-            f"- Slots created: {report['summary']['slots_created']}",
-            "",
-        ]
+        return "\n".join(self._iter_markdown_report_lines(report, avatar))
+
+    def _iter_markdown_report_lines(
+        self, report: Dict[str, Any], avatar: AvatarBundle
+    ) -> Iterator[str]:
+        """Yield the lines of the markdown mapping report in order."""
+        summary = report["summary"]
+        yield "# Avatar Mapping Report"
+        yield ""
+        yield "## Summary"
+        yield f"- Total layers: {summary['total_layers']}"
+        yield f"- Mapped layers: {summary['mapped_layers']}"
+        yield f"- Unmapped layers: {summary['unmapped_layers']}"
+        yield f"- Slots created: {summary['slots_created']}"
+        yield ""
 
         if report["warnings"]:
-            md_lines.extend(["## Warnings", ""])
+            yield "## Warnings"
+            yield ""
             for warning in report["warnings"]:
-                md_lines.append(f"- ⚠️ {warning}")
-            md_lines.append("")
+                yield f"- ⚠️ {warning}"
+            yield ""
 
-        md_lines.extend(["## Slot Coverage", ""])
+        yield "## Slot Coverage"
+        yield ""
 
         for slot_name, slot_def in avatar.slots.items():
-            md_lines.append(f"### {slot_name}")
+            yield f"### {slot_name}"
             if slot_def.states:
-                md_lines.append(f"- States: {', '.join(slot_def.states)}")
+                yield f"- States: {', '.join(slot_def.states)}"
             if slot_def.visemes:
-                md_lines.append(f"- Visemes: {', '.join(slot_def.visemes)}")
+                yield f"- Visemes: {', '.join(slot_def.visemes)}"
             if slot_def.emotions:
-                md_lines.append(f"- Emotions: {', '.join(slot_def.emotions)}")
+                yield f"- Emotions: {', '.join(slot_def.emotions)}"
             if slot_def.shapes:
-                md_lines.append(f"- Shapes: {', '.join(slot_def.shapes)}")
-            md_lines.append("")
+                yield f"- Shapes: {', '.join(slot_def.shapes)}"
+            yield ""
 
         if report["unmapped_layers"]:
-            md_lines.extend(["## Unmapped Layers", ""])
+            yield "## Unmapped Layers"
+            yield ""
             for layer_name in report["unmapped_layers"]:
-                md_lines.append(f"- {layer_name}")
-
-        return "\n".join(md_lines)
+                yield f"- {layer_name}"
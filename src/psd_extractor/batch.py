@@ -6,27 +6,284 @@ Handles batch processing of multiple PSD files and character extraction workflow
 
 import json
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    BrokenExecutor,
+    CancelledError,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple, Union
 
 from tqdm import tqdm
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .analyzer import PSDAnalyzer
 from .extractor import CharacterExtractor
 
 logger = logging.getLogger(__name__)
 
+# Per-file lines of the batch report
+_REPORT_SUCCESS_LINE = "✓ %s: %d expressions extracted"
+_REPORT_FAILURE_LINE = "✗ %s: %s"
+
+# Callback receiving (psd_path, result) and returning the value kept in memory
+ResultSink = Callable[[str, Dict], Dict]
+
+# Expression mapping shared with process pool workers, set once per worker
+_worker_mapping: Optional[Dict[str, List[str]]] = None
+
+
+def _init_worker(mapping: Optional[Dict[str, List[str]]]) -> None:
+    """
+    Store the batch expression mapping in a process pool worker.
+
+    Args:
+        mapping: Expression mapping used for every file the worker handles
+    """
+    global _worker_mapping
+    _worker_mapping = mapping
+
+
+def _file_stem(psd_path: str) -> str:
+    """
+    Get the file name of a path without its extension (like Path.stem).
+
+    Args:
+        psd_path: Path to PSD file
+
+    Returns:
+        File stem used to name the character output directory
+    """
+    return os.path.splitext(os.path.basename(psd_path))[0]
+
+
+def _strip_layer_objects(data: Any) -> Any:
+    """
+    Recursively drop psd-tools layer references from a result structure.
+
+    Layer objects keep their whole parsed PSD alive, so they must not be
+    pickled back from worker processes.
+
+    Args:
+        data: Analysis or summary data (dicts, lists and plain values)
+
+    Returns:
+        Copy of the data without any "layer_object" entries
+    """
+    if isinstance(data, dict):
+        return {
+            key: _strip_layer_objects(value)
+            for key, value in data.items()
+            if key != "layer_object"
+        }
+    if isinstance(data, list):
+        return [_strip_layer_objects(item) for item in data]
+    return data
+
+
+def _analyze_single_file(psd_path: str) -> Dict:
+    """
+    Analyze a single PSD file.
+
+    Defined at module level so it can be pickled for process pool workers.
+
+    Args:
+        psd_path: Path to PSD file
+
+    Returns:
+        Analysis results dictionary
+    """
+    try:
+        analyzer = PSDAnalyzer(psd_path)
+        return _strip_layer_objects(analyzer.analyze_layer_structure())
+    except Exception as e:
+        logger.error("Analysis failed for %s: %s", psd_path, e)
+        return {"error": str(e)}
+
+
+def _extract_single_file(
+    psd_path: str,
+    output_dir: str,
+    mapping: Optional[Dict[str, List[str]]] = None,
+) -> Dict:
+    """
+    Extract expressions from a single PSD file.
+
+    Defined at module level so it can be pickled for process pool workers.
+
+    Args:
+        psd_path: Path to PSD file
+        output_dir: Batch output directory
+        mapping: Expression mapping (defaults to the mapping installed by
+            _init_worker in process pool workers)
+
+    Returns:
+        Extraction results dictionary
+    """
+    if mapping is None:
+        mapping = _worker_mapping
+
+    try:
+        extractor = CharacterExtractor(psd_path, mapping)
+
+        # Output subdirectory for this character (created by extract_batch)
+        file_stem = _file_stem(psd_path)
+        char_output_str = os.path.join(output_dir, file_stem)
+
+        # Extract and save expressions
+        saved_files = extractor.extract_and_save(
+            char_output_str, custom_mapping=mapping, prefix=file_stem
+        )
+
+        # Get summary
+        summary = _strip_layer_objects(extractor.get_extraction_summary())
+
+        return {
+            "success": True,
+            "saved_files": saved_files,
+            "summary": summary,
+            "output_dir": char_output_str,
+        }
+
+    except Exception as e:
+        logger.error("Extraction failed for %s: %s", psd_path, e)
+        return {"success": False, "error": str(e)}
+
+
+def _encode_json_line(record: Dict[str, Any]) -> bytes:
+    """
+    Encode a result record as one UTF-8 NDJSON line.
+
+    Args:
+        record: JSON-compatible record (unknown types are stringified)
+
+    Returns:
+        Encoded line including the trailing newline
+    """
+    return _encode_json(record) + b"\n"
+
+
+def _encode_json(data: Any) -> bytes:
+    """
+    Encode data as UTF-8 JSON.
+
+    Args:
+        data: JSON-compatible data (unknown types are stringified)
+
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=str)
+    return json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _write_output_file(output_file: Union[str, Path], data: bytes) -> None:
+    """
+    Write a final output file without keeping it in the page cache.
+
+    Reports and mappings are not read back by the batch, so on platforms with
+    posix_fadvise the file is synced to disk and its now-clean pages are
+    released, leaving the page cache to the PSD sources.
+
+    Args:
+        output_file: Path to output file
+        data: File contents
+    """
+    with open(output_file, "wb") as f:
+        f.write(data)
+        f.flush()
+        if hasattr(os, "posix_fadvise"):
+            # DONTNEED only drops clean pages, so write the data out first
+            os.fdatasync(f.fileno())
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def _analyze_chunk(psd_paths: List[str]) -> Dict[str, Dict]:
+    """
+    Analyze a chunk of PSD files within one worker task.
+
+    Args:
+        psd_paths: Paths to PSD files
+
+    Returns:
+        Dictionary mapping file paths to analysis results
+    """
+    return {psd_path: _analyze_single_file(psd_path) for psd_path in psd_paths}
+
+
+def _extract_chunk(
+    psd_paths: List[str],
+    output_dir: str,
+    mapping: Optional[Dict[str, List[str]]] = None,
+) -> Dict[str, Dict]:
+    """
+    Extract expressions from a chunk of PSD files within one worker task.
+
+    Args:
+        psd_paths: Paths to PSD files
+        output_dir: Batch output directory
+        mapping: Expression mapping (see _extract_single_file)
+
+    Returns:
+        Dictionary mapping file paths to extraction results
+    """
+    return {
+        psd_path: _extract_single_file(psd_path, output_dir, mapping)
+        for psd_path in psd_paths
+    }
+
 
 class BatchProcessor:
     """Batch processor for multiple PSD files and extraction workflows."""
 
+    # File extensions recognised as Photoshop documents (matched case-insensitively)
+    PSD_EXTENSIONS = (".psd", ".psb")
+
+    # File header prefixes: "8BPS" signature followed by version 1 (PSD) or 2 (PSB)
+    PSD_SIGNATURES = (b"8BPS\x00\x01", b"8BPS\x00\x02")
+
+    # Size of the fixed PSD/PSB file header section
+    PSD_HEADER_SIZE = 26
+
+    # Upper bound for the automatically sized worker pool
+    MAX_WORKERS = 32
+
+    # Worker pool implementations selectable via executor_type
+    EXECUTOR_TYPES = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+
+    # Analysis cache file kept in output_dir, reused for unchanged PSD files
+    ANALYSIS_CACHE_FILE = ".analysis_cache.json"
+
+    # Bumped whenever the cache layout or analysis format changes, so caches
+    # written by other versions are discarded instead of misread
+    ANALYSIS_CACHE_VERSION = 1
+
     def __init__(
         self,
         input_dir: Optional[str] = None,
         output_dir: Optional[str] = None,
         mapping_file: Optional[str] = None,
-        max_workers: int = 4,
+        max_workers: Optional[int] = None,
+        executor_type: str = "process",
     ):
         """
         Initialize batch processor.
@@ -35,12 +292,22 @@ class BatchProcessor:
             input_dir: Directory containing PSD files
             output_dir: Directory for output files
             mapping_file: JSON file containing expression mapping
-            max_workers: Maximum number of concurrent workers
+            max_workers: Maximum number of concurrent workers (defaults to the
+                number of CPUs, capped at MAX_WORKERS)
+            executor_type: Worker pool type, "process" for CPU-bound PSD
+                compositing or "thread" to stay in the calling process
         """
+        if executor_type not in self.EXECUTOR_TYPES:
+            raise ValueError(
+                f"Unknown executor type '{executor_type}', "
+                f"expected one of {sorted(self.EXECUTOR_TYPES)}"
+            )
+
         self.input_dir = Path(input_dir) if input_dir else None
         self.output_dir = Path(output_dir) if output_dir else None
         self.mapping_file = mapping_file
-        self.max_workers = max_workers
+        self.max_workers = max_workers or min(self.MAX_WORKERS, os.cpu_count() or 1)
+        self.executor_type = executor_type
 
         self.expression_mapping = None
         if mapping_file:
@@ -54,11 +321,18 @@ class BatchProcessor:
             mapping_file: Path to JSON file containing expression mapping
         """
         try:
-            with open(mapping_file, "r", encoding="utf-8") as f:
-                self.expression_mapping = json.load(f)
-            logger.info(f"Loaded expression mapping from {mapping_file}")
+            with open(mapping_file, "rb") as f:
+                if ijson is not None:
+                    # Stream top-level entries instead of parsing the whole
+                    # document into an intermediate tree first
+                    self.expression_mapping = dict(ijson.kvitems(f, ""))
+                elif orjson is not None:
+                    self.expression_mapping = orjson.loads(f.read())
+                else:
+                    self.expression_mapping = json.load(f)
+            logger.info("Loaded expression mapping from %s", mapping_file)
         except Exception as e:
-            logger.error(f"Failed to load expression mapping: {e}")
+            logger.error("Failed to load expression mapping: %s", e)
             raise
 
     def save_expression_mapping(
@@ -72,40 +346,80 @@ class BatchProcessor:
             output_file: Path to output JSON file
         """
         try:
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(mapping, f, indent=2, ensure_ascii=False)
-            logger.info(f"Saved expression mapping to {output_file}")
+            if orjson is not None:
+                data = orjson.dumps(mapping, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(mapping, indent=2, ensure_ascii=False).encode("utf-8")
+            _write_output_file(output_file, data)
+            logger.info("Saved expression mapping to %s", output_file)
         except Exception as e:
-            logger.error(f"Failed to save expression mapping: {e}")
+            logger.error("Failed to save expression mapping: %s", e)
 
-    def find_psd_files(self, directory: Optional[str] = None) -> List[Path]:
+    def find_psd_files(
+        self,
+        directory: Optional[str] = None,
+        recursive: bool = False,
+        validate_headers: bool = True,
+    ) -> List[Path]:
         """
         Find all PSD files in a directory.
 
         Args:
             directory: Directory to search (uses input_dir if None)
+            recursive: Also search all subdirectories
+            validate_headers: Skip files whose header is not a PSD/PSB header,
+                so they never reach the worker pool
 
         Returns:
             List of Path objects for PSD files
         """
         search_dir = Path(directory) if directory else self.input_dir
 
-        if not search_dir or not search_dir.exists():
+        if not search_dir or not search_dir.is_dir():
             raise ValueError(f"Directory not found: {search_dir}")
 
-        psd_files = list(search_dir.glob("*.psd")) + list(search_dir.glob("*.psb"))
-        logger.info(f"Found {len(psd_files)} PSD files in {search_dir}")
+        psd_files, subdirs = self._scan_directory(str(search_dir))
+
+        if recursive and subdirs:
+            # Directory listing is latency-bound (especially on network mounts),
+            # so fan subdirectory scans out over a thread pool
+            with ThreadPoolExecutor() as executor:
+                pending = {executor.submit(self._scan_directory, d) for d in subdirs}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        try:
+                            files, child_dirs = future.result()
+                        except OSError as e:
+                            logger.warning("Skipping unreadable directory: %s", e)
+                            continue
+                        psd_files.extend(files)
+                        pending.update(
+                            executor.submit(self._scan_directory, d) for d in child_dirs
+                        )
+
+        if validate_headers and psd_files:
+            psd_files = self._filter_valid_headers(psd_files)
+
+        logger.info("Found %d PSD files in %s", len(psd_files), search_dir)
 
         return psd_files
 
     def analyze_batch(
-        self, psd_files: Optional[List[Union[str, Path]]] = None
+        self,
+        psd_files: Optional[List[Union[str, Path]]] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Dict]:
         """
         Analyze multiple PSD files to understand their structure.
 
         Args:
             psd_files: List of PSD file paths (finds automatically if None)
+            use_cache: Reuse analysis results for files whose modification time
+                and size are unchanged (requires output_dir). Results reused
+                from the cache are read back from JSON, so tuples come back as
+                lists, enums as their values and other non-JSON types as
+                strings; freshly analyzed results are returned unchanged.
 
         Returns:
             Dictionary mapping file paths to analysis results
@@ -113,54 +427,25 @@ class BatchProcessor:
         if psd_files is None:
             psd_files = self.find_psd_files()
 
-        analysis_results = {}
-
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit analysis tasks
-            future_to_file = {
-                executor.submit(self._analyze_single_file, str(psd_file)): psd_file
-                for psd_file in psd_files
-            }
-
-            # Collect results with progress bar
-            for future in tqdm(
-                as_completed(future_to_file),
-                total=len(future_to_file),
-                desc="Analyzing PSD files",
-            ):
-                psd_file = future_to_file[future]
-                try:
-                    result = future.result()
-                    analysis_results[str(psd_file)] = result
-                except Exception as e:
-                    logger.error(f"Failed to analyze {psd_file}: {e}")
-                    analysis_results[str(psd_file)] = {"error": str(e)}
+        if use_cache and self.output_dir:
+            analysis_results = self._analyze_with_cache(
+                [str(psd_file) for psd_file in psd_files],
+                self.output_dir / self.ANALYSIS_CACHE_FILE,
+            )
+        else:
+            analysis_results = self._run_batch(
+                _analyze_chunk, psd_files, "Analyzing PSD files"
+            )
 
-        logger.info(f"Analyzed {len(analysis_results)} PSD files")
+        logger.info("Analyzed %d PSD files", len(analysis_results))
         return analysis_results
 
-    def _analyze_single_file(self, psd_path: str) -> Dict:
-        """
-        Analyze a single PSD file.
-
-        Args:
-            psd_path: Path to PSD file
-
-        Returns:
-            Analysis results dictionary
-        """
-        try:
-            analyzer = PSDAnalyzer(psd_path)
-            return analyzer.analyze_layer_structure()
-        except Exception as e:
-            logger.error(f"Analysis failed for {psd_path}: {e}")
-            return {"error": str(e)}
-
     def extract_batch(
         self,
         psd_files: Optional[List[Union[str, Path]]] = None,
         output_dir: Optional[str] = None,
         custom_mapping: Optional[Dict[str, List[str]]] = None,
+        results_stream: Optional[str] = None,
     ) -> Dict[str, Dict]:
         """
         Extract expressions from multiple PSD files.
@@ -169,6 +454,9 @@ class BatchProcessor:
             psd_files: List of PSD file paths
             output_dir: Output directory for extracted images
             custom_mapping: Custom expression mapping
+            results_stream: Optional NDJSON file that full per-file results are
+                written to as they complete, replacing any previous contents;
+                the returned results then omit the bulky extraction summaries
 
         Returns:
             Dictionary mapping file paths to extraction results
@@ -183,91 +471,82 @@ class BatchProcessor:
             raise ValueError("Output directory not specified")
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        output_root = str(self.output_dir)
+
+        # Work with plain string paths from here on; they are what the workers
+        # receive and what the results are keyed by
+        psd_paths = list(dict.fromkeys(os.fspath(psd_file) for psd_file in psd_files))
+
+        # Each character's output directory is named after its file stem, so
+        # files like a/hero.psd and b/hero.psd would overwrite each other
+        # (compared case-insensitively for case-insensitive file systems)
+        paths_by_stem: Dict[str, List[str]] = {}
+        for psd_path in psd_paths:
+            paths_by_stem.setdefault(_file_stem(psd_path).casefold(), []).append(
+                psd_path
+            )
+        conflicts = [paths for paths in paths_by_stem.values() if len(paths) > 1]
+        if conflicts:
+            raise ValueError(
+                "PSD files would share an output directory: "
+                + "; ".join(", ".join(paths) for paths in conflicts)
+            )
 
-        mapping = custom_mapping or self.expression_mapping
-        extraction_results = {}
-
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit extraction tasks
-            future_to_file = {
-                executor.submit(
-                    self._extract_single_file, str(psd_file), mapping
-                ): psd_file
-                for psd_file in psd_files
-            }
-
-            # Collect results with progress bar
-            for future in tqdm(
-                as_completed(future_to_file),
-                total=len(future_to_file),
-                desc="Extracting characters",
-            ):
-                psd_file = future_to_file[future]
-                try:
-                    result = future.result()
-                    extraction_results[str(psd_file)] = result
-                except Exception as e:
-                    logger.error(f"Failed to extract from {psd_file}: {e}")
-                    extraction_results[str(psd_file)] = {"error": str(e)}
-
-        logger.info(f"Extracted from {len(extraction_results)} PSD files")
-        return extraction_results
-
-    def _extract_single_file(
-        self, psd_path: str, mapping: Optional[Dict[str, List[str]]]
-    ) -> Dict:
-        """
-        Extract expressions from a single PSD file.
-
-        Args:
-            psd_path: Path to PSD file
-            mapping: Expression mapping
-
-        Returns:
-            Extraction results dictionary
-        """
-        try:
-            extractor = CharacterExtractor(psd_path, mapping)
+        # Create every character subdirectory up front so workers don't race
+        # on mkdir calls in the shared output directory
+        for psd_path in psd_paths:
+            os.makedirs(os.path.join(output_root, _file_stem(psd_path)), exist_ok=True)
 
-            # Create output subdirectory for this character
-            file_stem = Path(psd_path).stem
-            char_output_dir = self.output_dir / file_stem
-            char_output_dir.mkdir(exist_ok=True)
+        mapping = custom_mapping or self.expression_mapping
 
-            # Extract and save expressions
-            saved_files = extractor.extract_and_save(
-                str(char_output_dir), custom_mapping=mapping, prefix=file_stem
+        # Process workers receive the mapping once through the pool initializer,
+        # so it only needs to travel with each task when using threads
+        task_mapping = None if self.executor_type == "process" else mapping
+
+        with open(results_stream, "wb") if results_stream else nullcontext() as stream:
+            result_sink = partial(self._stream_result, stream) if stream else None
+            extraction_results = self._run_batch(
+                _extract_chunk,
+                psd_paths,
+                "Extracting characters",
+                output_root,
+                task_mapping,
+                mapping=mapping,
+                result_sink=result_sink,
             )
 
-            # Get summary
-            summary = extractor.get_extraction_summary()
-
-            return {
-                "success": True,
-                "saved_files": saved_files,
-                "summary": summary,
-                "output_dir": str(char_output_dir),
-            }
-
-        except Exception as e:
-            logger.error(f"Extraction failed for {psd_path}: {e}")
-            return {"success": False, "error": str(e)}
+        logger.info("Extracted from %d PSD files", len(extraction_results))
+        return extraction_results
 
     def generate_batch_report(
-        self, results: Dict[str, Dict], output_file: Optional[str] = None
+        self,
+        results: Dict[Union[str, Path], Dict],
+        output_file: Optional[str] = None,
     ) -> str:
         """
         Generate a comprehensive batch processing report.
 
         Args:
-            results: Results from batch processing
+            results: Results from batch processing, keyed by str or Path
             output_file: Optional file to save report
 
         Returns:
             Report text
         """
+        # Count outcomes and format per-file lines in a single pass
+        successful = 0
+        file_lines = []
+        for file_path, result in results.items():
+            file_name = os.path.basename(file_path)
+            if result.get("success", False):
+                successful += 1
+                saved_count = len(result.get("saved_files", {}))
+                file_lines.append(_REPORT_SUCCESS_LINE % (file_name, saved_count))
+            else:
+                error = result.get("error", "Unknown error")
+                file_lines.append(_REPORT_FAILURE_LINE % (file_name, error))
+
         total_files = len(results)
-        successful = sum(1 for r in results.values() if r.get("success", False))
         failed = total_files - successful
 
         report_lines = [
@@ -280,27 +559,16 @@ class BatchProcessor:
             "Per-file Results:",
             "-" * 30,
         ]
-
-        for file_path, result in results.items():
-            file_name = Path(file_path).name
-            if result.get("success", False):
-                saved_count = len(result.get("saved_files", {}))
-                report_lines.append(
-                    f"✓ {file_name}: {saved_count} expressions extracted"
-                )
-            else:
-                error = result.get("error", "Unknown error")
-                report_lines.append(f"✗ {file_name}: {error}")
+        report_lines.extend(file_lines)
 
         report_text = "\n".join(report_lines)
 
         if output_file:
             try:
-                with open(output_file, "w", encoding="utf-8") as f:
-                    f.write(report_text)
-                logger.info(f"Saved batch report to {output_file}")
+                _write_output_file(output_file, report_text.encode("utf-8"))
+                logger.info("Saved batch report to %s", output_file)
             except Exception as e:
-                logger.error(f"Failed to save report: {e}")
+                logger.error("Failed to save report: %s", e)
 
         return report_text
 
@@ -334,7 +602,7 @@ class BatchProcessor:
         psd_files = self.find_psd_files()
 
         if not psd_files:
-            logger.warning(f"No PSD files found in {input_dir}")
+            logger.warning("No PSD files found in %s", input_dir)
             return {}
 
         # Extract expressions
@@ -345,5 +613,370 @@ class BatchProcessor:
             report_file = self.output_dir / "batch_report.txt"
             self.generate_batch_report(results, str(report_file))
 
-        logger.info(f"Batch processing complete: {len(results)} files processed")
+        logger.info("Batch processing complete: %d files processed", len(results))
+        return results
+
+    def _analyze_with_cache(
+        self, psd_paths: List[str], cache_file: Path
+    ) -> Dict[str, Dict]:
+        """
+        Analyze PSD files, skipping those with an up-to-date cached analysis.
+
+        Args:
+            psd_paths: Paths to PSD files
+            cache_file: Analysis cache file (created or updated as needed)
+
+        Returns:
+            Dictionary mapping file paths to analysis results
+        """
+        cache = self._load_analysis_cache(cache_file)
+        signatures = {
+            psd_path: self._file_signature(psd_path) for psd_path in psd_paths
+        }
+
+        results: Dict[str, Dict] = {}
+        stale_paths = []
+        for psd_path, signature in signatures.items():
+            entry = cache.get(psd_path)
+            if (
+                signature is not None
+                and isinstance(entry, dict)
+                and entry.get("signature") == signature
+                and isinstance(entry.get("analysis"), dict)
+            ):
+                results[psd_path] = entry["analysis"]
+            else:
+                stale_paths.append(psd_path)
+
+        logger.info(
+            "Reusing cached analysis for %d of %d PSD files",
+            len(results),
+            len(psd_paths),
+        )
+
+        if stale_paths:
+            fresh_results = self._run_batch(
+                _analyze_chunk, stale_paths, "Analyzing PSD files"
+            )
+            results.update(fresh_results)
+
+            # Signatures were taken before analysis, so a file modified while
+            # it was being analyzed is simply re-analyzed on the next run
+            for psd_path, analysis in fresh_results.items():
+                signature = signatures[psd_path]
+                if signature is not None and "error" not in analysis:
+                    cache[psd_path] = {"signature": signature, "analysis": analysis}
+            self._save_analysis_cache(cache_file, cache)
+
         return results
+
+    def _file_signature(self, psd_path: str) -> Optional[List[int]]:
+        """
+        Get the cache signature of a file.
+
+        Args:
+            psd_path: Path to PSD file
+
+        Returns:
+            [modification time in ns, size in bytes], or None if the file
+            cannot be stat'ed
+        """
+        try:
+            stat = os.stat(psd_path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _load_analysis_cache(self, cache_file: Path) -> Dict[str, Dict]:
+        """
+        Load the analysis cache, treating a missing or unreadable file as empty.
+
+        Args:
+            cache_file: Analysis cache file
+
+        Returns:
+            Cache entries keyed by PSD path, empty if the cache was written in
+            another format
+        """
+        try:
+            data = cache_file.read_bytes()
+        except FileNotFoundError:
+            return {}
+        except OSError as e:
+            logger.warning("Ignoring unreadable analysis cache %s: %s", cache_file, e)
+            return {}
+
+        try:
+            cache = orjson.loads(data) if orjson is not None else json.loads(data)
+        except ValueError as e:
+            logger.warning("Ignoring corrupt analysis cache %s: %s", cache_file, e)
+            return {}
+
+        if (
+            not isinstance(cache, dict)
+            or cache.get("version") != self.ANALYSIS_CACHE_VERSION
+            or not isinstance(cache.get("entries"), dict)
+        ):
+            logger.warning("Ignoring outdated analysis cache %s", cache_file)
+            return {}
+        return cache["entries"]
+
+    def _save_analysis_cache(self, cache_file: Path, cache: Dict[str, Dict]) -> None:
+        """
+        Save the analysis cache.
+
+        Args:
+            cache_file: Analysis cache file
+            cache: Cache entries keyed by PSD path
+        """
+        try:
+            data = _encode_json(
+                {"version": self.ANALYSIS_CACHE_VERSION, "entries": cache}
+            )
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_bytes(data)
+        except Exception as e:
+            logger.warning("Failed to save analysis cache: %s", e)
+
+    def _run_batch(
+        self,
+        chunk_worker: Callable[..., Dict[str, Dict]],
+        psd_files: List[Union[str, Path]],
+        desc: str,
+        *task_args: Any,
+        mapping: Optional[Dict[str, List[str]]] = None,
+        result_sink: Optional[ResultSink] = None,
+    ) -> Dict[str, Dict]:
+        """
+        Run a chunk worker over PSD files on the worker pool.
+
+        Args:
+            chunk_worker: Module-level function taking a list of paths plus
+                task_args and returning results keyed by path
+            psd_files: PSD files to process
+            desc: Progress bar description
+            *task_args: Extra arguments passed to every chunk task
+            mapping: Expression mapping to install in process pool workers
+            result_sink: Optional callback receiving each completed result and
+                returning the value to keep in memory
+
+        Returns:
+            Dictionary mapping file paths to results
+        """
+        psd_paths = [os.fspath(psd_file) for psd_file in psd_files]
+        chunk_size = self._get_chunk_size(len(psd_paths))
+        results: Dict[str, Dict] = {}
+
+        with self._create_executor(mapping) as executor, tqdm(
+            total=len(psd_paths), desc=desc
+        ) as progress:
+            # Submit files in chunks to amortise per-task scheduling and pickling
+            future_to_chunk = {
+                executor.submit(chunk_worker, chunk, *task_args): chunk
+                for chunk in (
+                    psd_paths[i : i + chunk_size]
+                    for i in range(0, len(psd_paths), chunk_size)
+                )
+            }
+
+            for future in as_completed(future_to_chunk):
+                # Workers report per-file failures in their result dict, so only
+                # pool-level failures surface as exceptions here
+                try:
+                    chunk_results = future.result()
+                except BrokenExecutor as e:
+                    logger.error("Worker pool failed, aborting batch: %s", e)
+                    self._abort_batch(
+                        future_to_chunk, psd_paths, results, str(e), result_sink
+                    )
+                    break
+                except CancelledError:
+                    # Only this task was cancelled; the pool itself still works
+                    logger.warning(
+                        "Worker task cancelled for %d files",
+                        len(future_to_chunk[future]),
+                    )
+                    chunk_results = {
+                        psd_path: {"error": "Task cancelled"}
+                        for psd_path in future_to_chunk[future]
+                    }
+                self._collect_results(chunk_results, results, result_sink)
+                progress.update(len(future_to_chunk[future]))
+
+        return results
+
+    def _abort_batch(
+        self,
+        future_to_chunk: Dict[Future, List[str]],
+        psd_paths: List[str],
+        results: Dict[str, Dict],
+        error: str,
+        result_sink: Optional[ResultSink] = None,
+    ) -> None:
+        """
+        Stop a batch after a fatal pool error.
+
+        Every unfinished chunk would fail the same way, so queued work is
+        cancelled, already finished chunks are kept and the remaining files
+        are marked as failed.
+
+        Args:
+            future_to_chunk: Submitted futures mapped to their file chunks
+            psd_paths: All file paths in the batch
+            results: Results collected so far (updated in place)
+            error: Error message recorded for unprocessed files
+            result_sink: Optional callback applied to each result (see _run_batch)
+        """
+        for future in future_to_chunk:
+            future.cancel()
+
+        for future in future_to_chunk:
+            if future.done() and not future.cancelled() and not future.exception():
+                self._collect_results(future.result(), results, result_sink)
+
+        unprocessed = {
+            psd_path: {"error": error}
+            for psd_path in psd_paths
+            if psd_path not in results
+        }
+        self._collect_results(unprocessed, results, result_sink)
+
+    def _collect_results(
+        self,
+        chunk_results: Dict[str, Dict],
+        results: Dict[str, Dict],
+        result_sink: Optional[ResultSink] = None,
+    ) -> None:
+        """
+        Merge a finished chunk into the batch results.
+
+        Args:
+            chunk_results: Results returned by a chunk worker
+            results: Batch results (updated in place)
+            result_sink: Optional callback applied to each result (see _run_batch)
+        """
+        if result_sink is None:
+            results.update(chunk_results)
+            return
+
+        for psd_path, result in chunk_results.items():
+            results[psd_path] = result_sink(psd_path, result)
+
+    def _stream_result(self, stream: IO[bytes], psd_path: str, result: Dict) -> Dict:
+        """
+        Append a full extraction result to the results stream.
+
+        Args:
+            stream: Binary NDJSON file opened for writing
+            psd_path: Path of the processed PSD file
+            result: Full extraction result
+
+        Returns:
+            Result without the extraction summary, to keep in memory
+        """
+        stream.write(_encode_json_line({"psd_file": psd_path, **result}))
+        return {key: value for key, value in result.items() if key != "summary"}
+
+    def _get_chunk_size(self, task_count: int) -> int:
+        """
+        Choose how many files each worker task should handle.
+
+        Args:
+            task_count: Total number of files in the batch
+
+        Returns:
+            Number of files per submitted task
+        """
+        if self.executor_type != "process":
+            # Thread tasks are not pickled, so per-file tasks balance best
+            return 1
+
+        # Aim for roughly four tasks per worker to keep the load balanced
+        return max(1, task_count // (4 * self.max_workers))
+
+    def _create_executor(
+        self, mapping: Optional[Dict[str, List[str]]] = None
+    ) -> Executor:
+        """
+        Create the worker pool used for batch operations.
+
+        Args:
+            mapping: Expression mapping to install in process pool workers
+
+        Returns:
+            Process or thread pool executor sized to max_workers
+        """
+        if self.executor_type == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(mapping,),
+            )
+
+        executor_class = self.EXECUTOR_TYPES[self.executor_type]
+        return executor_class(max_workers=self.max_workers)
+
+    def _filter_valid_headers(self, psd_files: List[Path]) -> List[Path]:
+        """
+        Drop files that do not start with a valid PSD/PSB header.
+
+        Args:
+            psd_files: Candidate PSD files
+
+        Returns:
+            Files with a valid header, in their original order
+        """
+        # Header reads are latency-bound, so run them on a thread pool
+        with ThreadPoolExecutor() as executor:
+            valid = list(executor.map(self._has_psd_header, psd_files))
+
+        return [psd_file for psd_file, ok in zip(psd_files, valid) if ok]
+
+    def _has_psd_header(self, psd_file: Path) -> bool:
+        """
+        Check whether a file starts with a PSD/PSB header.
+
+        Args:
+            psd_file: File to check
+
+        Returns:
+            True if the file has a complete PSD or PSB header
+        """
+        try:
+            with open(psd_file, "rb") as f:
+                header = f.read(self.PSD_HEADER_SIZE)
+        except OSError as e:
+            logger.warning("Skipping unreadable file %s: %s", psd_file, e)
+            return False
+
+        if len(header) < self.PSD_HEADER_SIZE or not header.startswith(
+            self.PSD_SIGNATURES
+        ):
+            logger.warning("Skipping %s: not a valid PSD/PSB file", psd_file)
+            return False
+
+        return True
+
+    def _scan_directory(self, directory: str) -> Tuple[List[Path], List[str]]:
+        """
+        List PSD files and subdirectories of a single directory.
+
+        Args:
+            directory: Directory to scan
+
+        Returns:
+            Tuple of (PSD file paths, subdirectory paths)
+        """
+        psd_files = []
+        subdirs = []
+
+        # Single directory pass; DirEntry caches the type so no extra stat calls
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.lower().endswith(self.PSD_EXTENSIONS):
+                    if entry.is_file():
+                        psd_files.append(Path(entry.path))
+
+        return psd_files, subdirs
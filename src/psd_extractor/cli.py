@@ -8,22 +8,44 @@ import json
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from operator import countOf
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import click
 from colorama import Fore, Style, init
 
-from .analyzer import PSDAnalyzer
-from .auto_mapper import AutoMapper
-from .avatar_builder import AvatarBuilder
-from .batch import BatchProcessor
-from .extractor import CharacterExtractor
-from .graph_builder import GraphBuilder
-from .pcs_scanner import PCSScanner
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Colour only interactive output, honouring the NO_COLOR convention
+USE_COLOR = sys.stdout.isatty() and not os.environ.get("NO_COLOR")
 
 # Initialize colorama for cross-platform colored output
-init()
+init(strip=not USE_COLOR)
+
+# Colour codes, empty when output is redirected
+GREEN = Fore.GREEN if USE_COLOR else ""
+RED = Fore.RED if USE_COLOR else ""
+YELLOW = Fore.YELLOW if USE_COLOR else ""
+BLUE = Fore.BLUE if USE_COLOR else ""
+BRIGHT = Style.BRIGHT if USE_COLOR else ""
+RESET = Style.RESET_ALL if USE_COLOR else ""
+
+# Status message prefixes, built once
+SUCCESS_PREFIX = f"{GREEN}✓ "
+ERROR_PREFIX = f"{RED}✗ "
+WARNING_PREFIX = f"{YELLOW}⚠ "
+INFO_PREFIX = f"{BLUE}ℹ "
 
 # Configure logging
 logging.basicConfig(
@@ -31,25 +53,116 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Avatar bundles above this size have their slots streamed rather than loaded whole
+STREAM_JSON_THRESHOLD = 16 * 1024 * 1024
+
+# PCS tag fields shown by scan --detailed, in display order
+PCS_DETAIL_FIELDS = ("group", "part", "side", "state", "viseme")
+
 
 def print_success(message: str) -> None:
     """Print success message in green."""
-    click.echo(f"{Fore.GREEN}✓ {message}{Style.RESET_ALL}")
+    click.echo(SUCCESS_PREFIX + message + RESET)
 
 
 def print_error(message: str) -> None:
     """Print error message in red."""
-    click.echo(f"{Fore.RED}✗ {message}{Style.RESET_ALL}")
+    click.echo(ERROR_PREFIX + message + RESET)
 
 
 def print_warning(message: str) -> None:
     """Print warning message in yellow."""
-    click.echo(f"{Fore.YELLOW}⚠ {message}{Style.RESET_ALL}")
+    click.echo(WARNING_PREFIX + message + RESET)
 
 
 def print_info(message: str) -> None:
     """Print info message in blue."""
-    click.echo(f"{Fore.BLUE}ℹ {message}{Style.RESET_ALL}")
+    click.echo(INFO_PREFIX + message + RESET)
+
+
+def _json_load(path: Union[str, Path]) -> Any:
+    """
+    Load a JSON file, using orjson when available.
+
+    Args:
+        path: Path to JSON file
+
+    Returns:
+        Parsed JSON data
+    """
+    # Whole-file byte reads skip the buffered text wrapper entirely
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dump(data: Any, path: Union[str, Path]) -> None:
+    """
+    Save data as indented JSON, using orjson when available.
+
+    The file is replaced atomically, so readers never see a partial write.
+
+    Args:
+        data: Data to save (unsupported types are stringified)
+        path: Path to output JSON file
+    """
+    if orjson is not None:
+        options = (
+            orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+        encoded = orjson.dumps(data, default=str, option=options)
+    else:
+        encoded = json.dumps(data, indent=2, ensure_ascii=False, default=str).encode(
+            "utf-8"
+        )
+    _atomic_write_bytes(path, encoded)
+
+
+def _atomic_write_bytes(path: Union[str, Path], data: bytes) -> None:
+    """
+    Write a file via a temporary sibling and an atomic rename.
+
+    Args:
+        path: Path to output file
+        data: File contents
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _iter_avatar_slots(avatar_file: Union[str, Path]) -> Iterator[Tuple[str, Dict]]:
+    """
+    Iterate over the slot definitions of an avatar bundle.
+
+    Large bundles are streamed with ijson so only the slots are materialized.
+
+    Args:
+        avatar_file: Path to avatar JSON file
+
+    Yields:
+        Tuples of (slot name, slot data)
+    """
+    if ijson is not None and os.path.getsize(avatar_file) > STREAM_JSON_THRESHOLD:
+        with open(avatar_file, "rb") as f:
+            yield from ijson.kvitems(f, "slots")
+        return
+    yield from _json_load(avatar_file).get("slots", {}).items()
 
 
 @click.group()
@@ -72,38 +185,49 @@ def analyze(psd_file: str, detailed: bool, output: Optional[str]) -> None:
     try:
         print_info(f"Analyzing PSD file: {psd_file}")
 
+        from .analyzer import PSDAnalyzer
+
         analyzer = PSDAnalyzer(psd_file)
 
         if detailed:
             # Full detailed analysis
             analysis = analyzer.analyze_layer_structure()
 
+            # Save to file if requested, in the background while the report is
+            # printed; the pool is shut down at once but finishes the write
+            save_future = None
+            if output:
+                io_pool = ThreadPoolExecutor(max_workers=1)
+                save_future = io_pool.submit(_json_dump, analysis, output)
+                io_pool.shutdown(wait=False)
+
+            # Collect the report and write it with a single echo
+            lines = []
+
             # Print basic info
             info = analysis["basic_info"]
-            click.echo(f"\n{Style.BRIGHT}PSD Information:{Style.RESET_ALL}")
-            click.echo(f"  Dimensions: {info['width']} x {info['height']}")
-            click.echo(f"  Total Layers: {info['total_layers']}")
+            lines.append(f"\n{BRIGHT}PSD Information:{RESET}")
+            lines.append(f"  Dimensions: {info['width']} x {info['height']}")
+            lines.append(f"  Total Layers: {info['total_layers']}")
 
             # Print expression layers
             expressions = analysis["expression_analysis"]
-            click.echo(
-                f"\n{Style.BRIGHT}Expression Layers ({len(expressions)}):{Style.RESET_ALL}"
-            )
+            lines.append(f"\n{BRIGHT}Expression Layers ({len(expressions)}):{RESET}")
             for expr in expressions:
                 keywords = ", ".join(expr["keywords"])
-                click.echo(f"  • {expr['name']} (keywords: {keywords})")
+                lines.append(f"  • {expr['name']} (keywords: {keywords})")
 
             # Print layer groups
             groups = analysis["layer_groups"]
-            click.echo(f"\n{Style.BRIGHT}Layer Groups:{Style.RESET_ALL}")
+            lines.append(f"\n{BRIGHT}Layer Groups:{RESET}")
             for group_type, layers in groups.items():
                 if layers:
-                    click.echo(f"  {group_type.title()}: {len(layers)} layers")
+                    lines.append(f"  {group_type.title()}: {len(layers)} layers")
 
-            # Save to file if requested
-            if output:
-                with open(output, "w", encoding="utf-8") as f:
-                    json.dump(analysis, f, indent=2, default=str)
+            click.echo("\n".join(lines))
+
+            if save_future is not None:
+                save_future.result()
                 print_success(f"Analysis saved to {output}")
 
         else:
@@ -163,11 +287,12 @@ def extract(
         # Load custom mapping if provided
         custom_mapping = None
         if mapping:
-            with open(mapping, "r", encoding="utf-8") as f:
-                custom_mapping = json.load(f)
+            custom_mapping = _json_load(mapping)
             print_info(f"Loaded custom mapping from {mapping}")
 
         # Initialize extractor
+        from .extractor import CharacterExtractor
+
         extractor = CharacterExtractor(psd_file, custom_mapping)
 
         # Get extraction summary
@@ -200,8 +325,13 @@ def extract(
 
         # Report results
         print_success(f"Successfully extracted {len(saved_files)} expressions:")
-        for state, file_path in saved_files.items():
-            click.echo(f"  • {state}: {file_path}")
+        if saved_files:
+            click.echo(
+                "\n".join(
+                    f"  • {state}: {file_path}"
+                    for state, file_path in saved_files.items()
+                )
+            )
 
         print_success(f"Output saved to: {output}")
 
@@ -229,19 +359,32 @@ def extract(
     "--workers", "-w", type=int, default=4, help="Number of concurrent workers"
 )
 @click.option("--report", is_flag=True, help="Generate processing report")
+@click.option(
+    "--io-bound",
+    is_flag=True,
+    help="Use worker threads instead of processes (for I/O-bound storage)",
+)
 def batch(
-    input_dir: str, output: str, mapping: Optional[str], workers: int, report: bool
+    input_dir: str,
+    output: str,
+    mapping: Optional[str],
+    workers: int,
+    report: bool,
+    io_bound: bool,
 ) -> None:
     """Batch process multiple PSD files in a directory."""
     try:
         print_info(f"Starting batch processing: {input_dir}")
 
         # Initialize batch processor
+        from .batch import BatchProcessor
+
         processor = BatchProcessor(
             input_dir=input_dir,
             output_dir=output,
             mapping_file=mapping,
             max_workers=workers,
+            executor_type="thread" if io_bound else "process",
         )
 
         # Find PSD files
@@ -253,11 +396,11 @@ def batch(
 
         print_info(f"Found {len(psd_files)} PSD files to process")
 
-        # Process all files
-        results = processor.extract_batch()
+        # Process all files (reusing the scan above)
+        results = processor.extract_batch(psd_files)
 
-        # Count results
-        successful = sum(1 for r in results.values() if r.get("success", False))
+        # Count results in C; entries without a "success" key count as failed
+        successful = countOf(map(dict.get, results.values(), repeat("success")), True)
         total = len(results)
 
         if successful == total:
@@ -302,8 +445,7 @@ def create_mapping(output: str) -> None:
             "_examples": {"custom_state": ["layer_name_1", "layer_name_2"]},
         }
 
-        with open(output, "w", encoding="utf-8") as f:
-            json.dump(mapping_template, f, indent=2, ensure_ascii=False)
+        _json_dump(mapping_template, output)
 
         print_success(f"Expression mapping template created: {output}")
         print_info("Edit this file to match your PSD layer names")
@@ -320,6 +462,8 @@ def list_expressions(psd_file: str) -> None:
     try:
         print_info(f"Listing expressions in: {psd_file}")
 
+        from .extractor import CharacterExtractor
+
         extractor = CharacterExtractor(psd_file)
         expressions = extractor.get_available_expressions()
 
@@ -327,21 +471,20 @@ def list_expressions(psd_file: str) -> None:
             print_warning("No expression layers found")
             return
 
-        click.echo(
-            f"\n{Style.BRIGHT}Available Expressions ({len(expressions)}):{Style.RESET_ALL}"
-        )
-        for expr in expressions:
-            click.echo(f"  • {expr}")
+        lines = [f"\n{BRIGHT}Available Expressions ({len(expressions)}):{RESET}"]
+        lines.extend(f"  • {expr}" for expr in expressions)
+        click.echo("\n".join(lines))
 
         # Show mapping possibilities
         summary = extractor.get_extraction_summary()
         mappable = summary["mappable_lip_sync_states"]
 
         if mappable:
-            click.echo(f"\n{Style.BRIGHT}Mappable to Lip Sync States:{Style.RESET_ALL}")
+            lines = [f"\n{BRIGHT}Mappable to Lip Sync States:{RESET}"]
             for state, expr_names in mappable.items():
                 expr_list = ", ".join(expr_names)
-                click.echo(f"  {state}: {expr_list}")
+                lines.append(f"  {state}: {expr_list}")
+            click.echo("\n".join(lines))
 
     except Exception as e:
         print_error(f"Failed to list expressions: {e}")
@@ -383,6 +526,8 @@ def ingest(
         print_info(f"Processing PSD file: {psd_file}")
 
         # Build avatar bundle
+        from .avatar_builder import AvatarBuilder
+
         builder = AvatarBuilder(psd_file, output, rules)
         avatar = builder.build_avatar(name)
 
@@ -430,26 +575,20 @@ def graph(avatar_bundle: str, preset: str, output: Optional[str]) -> None:
     try:
         print_info(f"Loading avatar bundle: {avatar_bundle}")
 
-        # Load avatar bundle
-        with open(avatar_bundle, "r", encoding="utf-8") as f:
-            avatar_data = json.load(f)
-
         # Convert to AvatarBundle object (simplified loading)
         from .models.avatar import AvatarBundle, SlotDefinition
 
         avatar = AvatarBundle()
 
         # Load slots
-        for slot_name, slot_data in avatar_data.get("slots", {}).items():
-            slot_def = SlotDefinition(
-                states=slot_data.get("states"),
-                visemes=slot_data.get("visemes"),
-                emotions=slot_data.get("emotions"),
-                shapes=slot_data.get("shapes"),
-            )
-            avatar.slots[slot_name] = slot_def
+        avatar.slots = {
+            slot_name: SlotDefinition.from_dict(slot_data)
+            for slot_name, slot_data in _iter_avatar_slots(avatar_bundle)
+        }
 
         # Build graph
+        from .graph_builder import GraphBuilder
+
         builder = GraphBuilder(avatar)
 
         if preset == "idle-talk":
@@ -459,11 +598,12 @@ def graph(avatar_bundle: str, preset: str, output: Optional[str]) -> None:
 
         # Determine output path
         if not output:
-            bundle_dir = Path(avatar_bundle).parent
-            output = str(bundle_dir / f"graph.{preset}.json")
+            bundle_dir = os.path.dirname(avatar_bundle)
+            output = os.path.join(bundle_dir, f"graph.{preset}.json")
 
         # Save graph
-        graph_file = builder.save_graph(graph, Path(output).parent, Path(output).name)
+        output_dir, output_name = os.path.split(output)
+        graph_file = builder.save_graph(graph, output_dir, output_name)
         print_success(f"Expression graph saved: {graph_file}")
 
     except Exception as e:
@@ -496,17 +636,21 @@ def preview(avatar_dir: str, port: int, open_browser: bool) -> None:
         print_info(f"Server will be available at: http://localhost:{port}")
 
         # For now, just validate the files and show info
-        with open(avatar_json, "r", encoding="utf-8") as f:
-            avatar_data = json.load(f)
+        slot_count = sum(1 for _ in _iter_avatar_slots(avatar_json))
 
         print_success("Avatar bundle validation passed")
-        print_info(f"Slots found: {len(avatar_data.get('slots', {}))}")
+        print_info(f"Slots found: {slot_count}")
         print_info(f"Atlas: {atlas_png.name}")
 
-        # Find graph files
-        graph_files = list(avatar_path.glob("graph.*.json"))
+        # Find graph files (scandir avoids a stat call per directory entry)
+        with os.scandir(avatar_path) as entries:
+            graph_files = [
+                entry.name
+                for entry in entries
+                if entry.name.startswith("graph.") and entry.name.endswith(".json")
+            ]
         if graph_files:
-            print_info(f"Expression graphs: {[f.name for f in graph_files]}")
+            print_info(f"Expression graphs: {graph_files}")
 
         # TODO: Implement actual preview server with PixiJS demo
         print_warning("Interactive preview server not yet implemented")
@@ -525,6 +669,8 @@ def scan(psd_file: str, detailed: bool) -> None:
     try:
         print_info(f"Scanning PSD file: {psd_file}")
 
+        from .pcs_scanner import PCSScanner
+
         scanner = PCSScanner(psd_file)
         layers = scanner.scan_layers()
 
@@ -533,48 +679,47 @@ def scan(psd_file: str, detailed: bool) -> None:
         # Show statistics
         stats = scanner.get_layer_statistics(layers)
 
-        click.echo(f"\n{Style.BRIGHT}Layer Statistics:{Style.RESET_ALL}")
-        click.echo(f"  Total layers: {stats['total_layers']}")
-        click.echo(f"  Tagged layers: {stats['tagged_layers']}")
+        # Collect the report and write it with a single echo
+        lines = [
+            f"\n{BRIGHT}Layer Statistics:{RESET}",
+            f"  Total layers: {stats['total_layers']}",
+            f"  Tagged layers: {stats['tagged_layers']}",
+        ]
 
         if stats["groups"]:
-            click.echo(f"\n{Style.BRIGHT}Groups:{Style.RESET_ALL}")
+            lines.append(f"\n{BRIGHT}Groups:{RESET}")
             for group, count in stats["groups"].items():
-                click.echo(f"  {group}: {count} layers")
+                lines.append(f"  {group}: {count} layers")
 
         if stats["parts"]:
-            click.echo(f"\n{Style.BRIGHT}Parts:{Style.RESET_ALL}")
+            lines.append(f"\n{BRIGHT}Parts:{RESET}")
             for part, count in stats["parts"].items():
-                click.echo(f"  {part}: {count} layers")
+                lines.append(f"  {part}: {count} layers")
 
         if stats["visemes"]:
-            click.echo(f"\n{Style.BRIGHT}Visemes found:{Style.RESET_ALL}")
-            click.echo(f"  {', '.join(stats['visemes'])}")
+            lines.append(f"\n{BRIGHT}Visemes found:{RESET}")
+            lines.append(f"  {', '.join(stats['visemes'])}")
 
         if stats["states"]:
-            click.echo(f"\n{Style.BRIGHT}States found:{Style.RESET_ALL}")
-            click.echo(f"  {', '.join(stats['states'])}")
+            lines.append(f"\n{BRIGHT}States found:{RESET}")
+            lines.append(f"  {', '.join(stats['states'])}")
 
         if detailed:
-            click.echo(f"\n{Style.BRIGHT}Detailed Layer Information:{Style.RESET_ALL}")
+            lines.append(f"\n{BRIGHT}Detailed Layer Information:{RESET}")
             for layer in layers:
-                if layer.pcs_tag:
-                    tag_info = []
-                    if layer.pcs_tag.group:
-                        tag_info.append(f"group={layer.pcs_tag.group}")
-                    if layer.pcs_tag.part:
-                        tag_info.append(f"part={layer.pcs_tag.part}")
-                    if layer.pcs_tag.side:
-                        tag_info.append(f"side={layer.pcs_tag.side}")
-                    if layer.pcs_tag.state:
-                        tag_info.append(f"state={layer.pcs_tag.state}")
-                    if layer.pcs_tag.viseme:
-                        tag_info.append(f"viseme={layer.pcs_tag.viseme}")
-
-                    tag_str = f" [{' '.join(tag_info)}]" if tag_info else ""
-                    click.echo(f"  • {layer.name}{tag_str}")
+                tag = layer.pcs_tag
+                if tag:
+                    tag_info = " ".join(
+                        f"{name}={value}"
+                        for name in PCS_DETAIL_FIELDS
+                        if (value := getattr(tag, name))
+                    )
+                    tag_str = f" [{tag_info}]" if tag_info else ""
+                    lines.append(f"  • {layer.name}{tag_str}")
                 else:
-                    click.echo(f"  • {layer.name} (untagged)")
+                    lines.append(f"  • {layer.name} (untagged)")
+
+        click.echo("\n".join(lines))
 
     except Exception as e:
         print_error(f"Scan failed: {e}")
@@ -6,17 +6,120 @@ Extracts character expressions from PSD files and maps them to lip sync states.
 
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 from psd_tools import PSDImage
 
 from .analyzer import PSDAnalyzer
 from .optimizer import ImageOptimizer
 
+try:
+    import pyspng
+except ImportError:
+    pyspng = None
+
 logger = logging.getLogger(__name__)
 
 
+def _render_visible(layer) -> bool:
+    """
+    Layer filter matching psd-tools' default visibility check.
+
+    Passing a layer_filter makes composite() render the layer stack. Without
+    one it returns the merged preview saved in the file, which ignores both
+    the viewport and any visibility changes made since loading.
+
+    Args:
+        layer: Layer being considered for rendering
+
+    Returns:
+        True if the layer is visible
+    """
+    return layer.is_visible()
+
+
+def _alpha_extrema(image) -> Tuple[int, int]:
+    """
+    Get the alpha range of an image without converting the whole image.
+
+    Args:
+        image: PIL Image to inspect
+
+    Returns:
+        Tuple of (min, max) alpha values; images without alpha are opaque
+    """
+    if "A" in image.getbands():
+        # Only the alpha band is copied out, not a full RGBA image
+        return image.getchannel("A").getextrema()
+    if "transparency" in image.info:
+        return image.convert("RGBA").getchannel("A").getextrema()
+    return 255, 255
+
+
+# Extractor owned by a process pool worker, set up by _init_extraction_worker
+_worker_extractor: Optional["CharacterExtractor"] = None
+
+
+def _init_extraction_worker(psd_path: str) -> None:
+    """
+    Open the PSD once in a process pool worker.
+
+    Each worker needs its own PSD because layer visibility is toggled during
+    compositing and PSDImage objects cannot be shared across processes.
+
+    Args:
+        psd_path: Path to the PSD file
+    """
+    global _worker_extractor
+    _worker_extractor = CharacterExtractor(psd_path)
+
+
+def _extract_state_in_process(
+    sync_state: str, expression_names: List[str]
+) -> Tuple[Optional[str], Optional[any]]:
+    """
+    Extract one lip sync state in a worker process.
+
+    Args:
+        sync_state: Lip sync state being extracted
+        expression_names: Candidate expression layer names, in priority order
+
+    Returns:
+        Tuple of (expression name used, PIL Image), or (None, None)
+    """
+    return _worker_extractor._extract_state(sync_state, expression_names)
+
+
+def _extract_expression_in_process(expression_name: str) -> Optional[any]:
+    """
+    Extract one expression in a worker process.
+
+    Args:
+        expression_name: Name of the expression layer to extract
+
+    Returns:
+        PIL Image of the expression, or None if extraction fails
+    """
+    return _worker_extractor.extract_expression(expression_name)
+
+
+def _extract_component_in_process(component_name: str) -> Optional[any]:
+    """
+    Extract one component in a worker process.
+
+    Args:
+        component_name: Name of the component layer to extract
+
+    Returns:
+        PIL Image of the component, or None if extraction fails
+    """
+    return _worker_extractor.extract_component(component_name)
+
+
 class CharacterExtractor:
     """Main class for extracting character expressions from PSD files."""
 
@@ -28,8 +131,22 @@ class CharacterExtractor:
         "wide": ["shocked", "laugh", "surprised"],
     }
 
+    # Component categories composited over the character's base layers, and
+    # the layer name keywords identifying those base layers
+    BASE_CONTEXT_CATEGORIES = frozenset({"clothing", "accessories", "shoes", "bottom"})
+    BASE_LAYER_KEYWORDS = ("body", "base", "skin")
+
+    # Upper bound for concurrent image encoding in save_expressions
+    MAX_SAVE_WORKERS = 8
+
+    # zlib level used when PNGs are encoded with pyspng (PIL's default)
+    PNG_COMPRESS_LEVEL = 6
+
     def __init__(
-        self, psd_path: str, expression_mapping: Optional[Dict[str, List[str]]] = None
+        self,
+        psd_path: str,
+        expression_mapping: Optional[Dict[str, List[str]]] = None,
+        psd: Optional[PSDImage] = None,
     ):
         """
         Initialize the character extractor.
@@ -37,24 +154,84 @@ class CharacterExtractor:
         Args:
             psd_path: Path to the PSD file
             expression_mapping: Custom mapping of lip sync states to expression names
+            psd: Already opened PSD to use instead of reopening psd_path
         """
         self.psd_path = psd_path
-        self.psd = None
-        self.analyzer = PSDAnalyzer(psd_path)
+        self.psd = psd
+        self._base_composite = None
+        self._available_expressions: Optional[List[str]] = None
+        self._all_layers: Optional[List[any]] = None
+        self._toggleable_layers: Optional[List[any]] = None
+        self._category_by_component: Optional[Dict[str, str]] = None
+        self._base_layers: Optional[List[any]] = None
+        self._lineage_ids: Dict[int, FrozenSet[int]] = {}
+        self._expressions_hidden = False
+        if self.psd is None:
+            self._load_psd()
+
+        # The analyzer works on the same PSD object, so layers it looks up are
+        # the ones composited here and the file is only parsed once
+        self.analyzer = PSDAnalyzer(psd_path, psd=self.psd)
         self.optimizer = ImageOptimizer()
 
         self.expression_mapping = expression_mapping or self.DEFAULT_EXPRESSION_MAPPING
-        self._load_psd()
 
     def _load_psd(self) -> None:
         """Load and validate the PSD file."""
         try:
             self.psd = PSDImage.open(self.psd_path)
-            logger.info(f"Loaded PSD file: {self.psd_path}")
+            logger.info("Loaded PSD file: %s", self.psd_path)
         except Exception as e:
-            logger.error(f"Failed to load PSD file: {e}")
+            logger.error("Failed to load PSD file: %s", e)
             raise
 
+    def _get_all_layers(self) -> List[any]:
+        """
+        Get every layer in the PSD, walking the layer tree only once.
+
+        Returns:
+            List of all layers in depth-first order
+        """
+        if self._all_layers is None:
+            self._all_layers = list(self.psd.descendants())
+        return self._all_layers
+
+    def _get_toggleable_layers(self) -> List[any]:
+        """
+        Get the named layers that have a visibility flag, computed only once.
+
+        Layer types don't change after loading, so the attribute checks are
+        done here once and callers can use both attributes directly.
+
+        Returns:
+            List of layers whose visibility can be toggled
+        """
+        if self._toggleable_layers is None:
+            self._toggleable_layers = [
+                layer
+                for layer in self._get_all_layers()
+                if hasattr(layer, "visible") and hasattr(layer, "name")
+            ]
+        return self._toggleable_layers
+
+    def _get_base_layers(self) -> List[any]:
+        """
+        Get the body/base/skin layers shown behind clothing and accessories.
+
+        Returns:
+            List of base layers, found by a single keyword scan
+        """
+        if self._base_layers is None:
+            self._base_layers = [
+                layer
+                for layer in self._get_toggleable_layers()
+                if any(
+                    keyword in layer.name.lower()
+                    for keyword in self.BASE_LAYER_KEYWORDS
+                )
+            ]
+        return self._base_layers
+
     def set_expression_mapping(self, mapping: Dict[str, List[str]]) -> None:
         """
         Set custom expression mapping for lip sync states.
@@ -63,7 +240,7 @@ class CharacterExtractor:
             mapping: Dictionary mapping lip sync states to expression layer names
         """
         self.expression_mapping = mapping
-        logger.info(f"Updated expression mapping: {list(mapping.keys())}")
+        logger.info("Updated expression mapping: %s", list(mapping.keys()))
 
     def get_available_expressions(self) -> List[str]:
         """
@@ -72,8 +249,11 @@ class CharacterExtractor:
         Returns:
             List of expression layer names found in the PSD
         """
-        expressions = self.analyzer.find_expression_layers()
-        return [expr["name"] for expr in expressions]
+        # The layer structure doesn't change after loading, so scan it once
+        if self._available_expressions is None:
+            expressions = self.analyzer.find_expression_layers()
+            self._available_expressions = [expr["name"] for expr in expressions]
+        return list(self._available_expressions)
 
     def get_all_components(self) -> Dict[str, List[Dict[str, any]]]:
         """
@@ -93,6 +273,26 @@ class CharacterExtractor:
         """
         return self.analyzer.get_extractable_components()
 
+    def _get_component_category(self, component_name: str) -> Optional[str]:
+        """
+        Look up the category of an extractable component.
+
+        The name to category index is built on first use, so extracting many
+        components doesn't re-run component detection for each one.
+
+        Args:
+            component_name: Name of the component layer
+
+        Returns:
+            Component category, or None if it is not an extractable component
+        """
+        if self._category_by_component is None:
+            self._category_by_component = {}
+            for comp in self.get_extractable_components():
+                # First match wins, as with a linear search
+                self._category_by_component.setdefault(comp["name"], comp["category"])
+        return self._category_by_component.get(component_name)
+
     def get_components_by_category(self, category: str) -> List[Dict[str, any]]:
         """
         Get all components in a specific category.
@@ -128,176 +328,129 @@ class CharacterExtractor:
             raise ValueError("PSD file not loaded")
 
         try:
-            logger.info(f"Starting raw layer extraction for: '{layer_name}'")
+            logger.info("Starting raw layer extraction for: '%s'", layer_name)
 
             # Find the target layer
             target_layer = self.analyzer.get_layer_by_name(layer_name)
             if not target_layer:
-                logger.error(f"Layer '{layer_name}' not found in PSD")
+                logger.error("Layer '%s' not found in PSD", layer_name)
                 return None
 
-            logger.debug(
-                f"Found target layer: '{target_layer.name}' (type: {type(target_layer)})"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                # Counting layers walks the whole tree, so only do it when shown
+                logger.debug(
+                    "Found target layer: '%s' (type: %s)",
+                    target_layer.name,
+                    type(target_layer),
+                )
+                logger.debug(
+                    "Found %s total layers in PSD", len(self._get_all_layers())
+                )
 
-            # Save original visibility states
-            original_visibility = {}
-            all_layers = list(self.psd.descendants())
-            logger.debug(f"Found {len(all_layers)} total layers in PSD")
-
-            visible_layers_before = []
-            for layer in all_layers:
-                if hasattr(layer, "visible"):
-                    original_visibility[layer.name] = layer.visible
-                    if layer.visible:
-                        visible_layers_before.append(layer.name)
-
-            logger.debug(f"Originally visible layers: {visible_layers_before}")
-
-            try:
-                # Hide ALL layers first
-                hidden_count = 0
-                for layer in all_layers:
-                    if hasattr(layer, "visible"):
-                        layer.visible = False
-                        hidden_count += 1
-
-                logger.debug(f"Hidden {hidden_count} layers")
-
-                # Show ONLY the target layer - no context, no base layers
-                target_layer.visible = True
-
-                # CRITICAL: Also make sure all parent groups are visible
-                # If a parent group is hidden, the child layer won't show
-                current = target_layer
-                parent_groups_made_visible = []
-                while hasattr(current, "parent") and current.parent is not None:
-                    parent = current.parent
-                    if hasattr(parent, "visible") and hasattr(parent, "name"):
-                        if not parent.visible:
-                            parent.visible = True
-                            parent_groups_made_visible.append(parent.name)
-                            logger.debug(f"Made parent group visible: {parent.name}")
-                    current = parent
+            # Render ONLY the target layer - no context, no base layers. Its
+            # parent groups are let through too, or the layer wouldn't show.
+            # psd-tools skips every other layer itself, so no visibility flags
+            # need to be changed and restored
+            layer_filter = self._only_layers_filter([target_layer])
 
-                logger.info(
-                    f"Isolated layer '{layer_name}' - made {len(parent_groups_made_visible)} parent groups visible: {parent_groups_made_visible}"
-                )
+            # Try two different approaches for layer extraction
 
-                # Debug: Check final visibility state
-                visible_after = []
-                for layer in all_layers:
-                    if (
-                        hasattr(layer, "visible")
-                        and layer.visible
-                        and hasattr(layer, "name")
-                    ):
-                        visible_after.append(layer.name)
+            # Approach 1: Direct layer compositing (try this first for better isolation)
+            layer_image = self._try_direct_composite(target_layer, layer_filter)
+            if layer_image is not None:
+                # The full PSD composite below is only needed on failure
+                return layer_image
 
-                logger.debug(f"Layers visible after isolation: {visible_after}")
+            # Approach 2: Full PSD composite restricted to the layer (fallback)
+            logger.debug("Falling back to full PSD composite with a layer filter")
+            composite_image = self.psd.composite(layer_filter=layer_filter)
 
-                # Try two different approaches for layer extraction
+            if composite_image:
+                logger.info(
+                    "PSD composite extraction: %s - Size: %s",
+                    layer_name,
+                    composite_image.size,
+                )
 
-                # Approach 1: Direct layer compositing (try this first for better isolation)
-                try:
-                    if hasattr(target_layer, "composite") and callable(
-                        target_layer.composite
-                    ):
-                        logger.debug(
-                            f"Attempting direct layer composite for: {layer_name}"
-                        )
-                        layer_image = target_layer.composite()
+                # Additional debug: Check if image is actually different from full composite
+                if hasattr(composite_image, "getextrema"):
+                    try:
+                        alpha_extrema = _alpha_extrema(composite_image)
+                        logger.debug("PSD composite alpha range: %s", alpha_extrema)
 
-                        if layer_image and layer_image.size != (0, 0):
+                        if alpha_extrema[0] == 0:  # Has transparent pixels
                             logger.info(
-                                f"Direct layer composite successful - Size: {layer_image.size}"
+                                "PSD composite has transparency - partial isolation achieved"
                             )
-
-                            # Check if this gives us better isolation
-                            if hasattr(layer_image, "getextrema"):
-                                try:
-                                    rgba_image = layer_image.convert("RGBA")
-                                    alpha_extrema = rgba_image.split()[-1].getextrema()
-                                    logger.debug(
-                                        f"Direct layer alpha range: {alpha_extrema}"
-                                    )
-
-                                    if alpha_extrema[0] == 0:  # Has transparency
-                                        logger.info(
-                                            f"Direct layer extraction has transparency - using this method"
-                                        )
-                                        return layer_image
-                                except Exception as e:
-                                    logger.debug(
-                                        f"Could not analyze direct layer transparency: {e}"
-                                    )
-
-                            return layer_image
                         else:
-                            logger.debug(
-                                f"Direct layer composite returned empty/invalid image"
+                            logger.warning(
+                                "PSD composite has no transparency - likely full composite"
                             )
-                    else:
+                    except Exception as e:
                         logger.debug(
-                            f"Layer {layer_name} does not support direct composite"
+                            "Could not analyze PSD composite transparency: %s", e
                         )
-                except Exception as e:
-                    logger.debug(f"Direct layer composite failed: {e}")
-
-                # Approach 2: Full PSD composite with visibility manipulation (fallback)
-                logger.debug(
-                    f"Falling back to full PSD composite with visibility manipulation"
+            else:
+                logger.warning(
+                    "PSD composite returned None for raw layer: %s", layer_name
                 )
-                composite_image = self.psd.composite()
 
-                if composite_image:
-                    logger.info(
-                        f"PSD composite extraction: {layer_name} - Size: {composite_image.size}"
-                    )
+            return composite_image
 
-                    # Additional debug: Check if image is actually different from full composite
-                    if hasattr(composite_image, "getextrema"):
-                        try:
-                            # Convert to RGBA to check alpha channel
-                            rgba_image = composite_image.convert("RGBA")
-                            alpha_extrema = rgba_image.split()[
-                                -1
-                            ].getextrema()  # Get alpha channel extrema
-                            logger.debug(f"PSD composite alpha range: {alpha_extrema}")
-
-                            if alpha_extrema[0] == 0:  # Has transparent pixels
-                                logger.info(
-                                    f"PSD composite has transparency - partial isolation achieved"
-                                )
-                            else:
-                                logger.warning(
-                                    f"PSD composite has no transparency - likely full composite"
-                                )
-                        except Exception as e:
-                            logger.debug(
-                                f"Could not analyze PSD composite transparency: {e}"
-                            )
-                else:
-                    logger.warning(
-                        f"PSD composite returned None for raw layer: {layer_name}"
-                    )
+        except Exception as e:
+            logger.error("Failed to extract raw layer '%s': %s", layer_name, e)
+            return None
 
-                return composite_image
+    def _try_direct_composite(
+        self, layer, layer_filter: Callable[[any], bool]
+    ) -> Optional[any]:
+        """
+        Composite a single layer on its own.
 
-            finally:
-                # Restore original visibility states
-                restored_count = 0
-                for layer in all_layers:
-                    if hasattr(layer, "visible") and layer.name in original_visibility:
-                        layer.visible = original_visibility[layer.name]
-                        restored_count += 1
+        Args:
+            layer: Layer to composite
+            layer_filter: psd-tools layer filter selecting what is rendered
 
-                logger.debug(f"Restored visibility for {restored_count} layers")
+        Returns:
+            PIL Image of the layer, or None if the layer cannot be
+            composited directly or the result is empty
+        """
+        composite = getattr(layer, "composite", None)
+        if not callable(composite):
+            logger.debug("Layer %s does not support direct composite", layer.name)
+            return None
 
+        try:
+            logger.debug("Attempting direct layer composite for: %s", layer.name)
+            layer_image = composite(layer_filter=layer_filter)
         except Exception as e:
-            logger.error(f"Failed to extract raw layer '{layer_name}': {e}")
+            logger.debug("Direct layer composite failed: %s", e)
             return None
 
+        if not layer_image or layer_image.size == (0, 0):
+            logger.debug("Direct layer composite returned empty/invalid image")
+            return None
+
+        logger.info("Direct layer composite successful - Size: %s", layer_image.size)
+
+        if not logger.isEnabledFor(logging.INFO):
+            # The alpha check below only feeds log messages
+            return layer_image
+
+        # Check if this gives us better isolation
+        try:
+            alpha_extrema = _alpha_extrema(layer_image)
+            logger.debug("Direct layer alpha range: %s", alpha_extrema)
+
+            if alpha_extrema[0] == 0:  # Has transparency
+                logger.info(
+                    "Direct layer extraction has transparency - using this method"
+                )
+        except Exception as e:
+            logger.debug("Could not analyze direct layer transparency: %s", e)
+
+        return layer_image
+
     def extract_expression(self, expression_name: str) -> Optional[any]:
         """
         Extract a single expression from the PSD.
@@ -318,35 +471,141 @@ class CharacterExtractor:
                 logger.error("No expression group found in PSD")
                 return None
 
-            # Hide all expression layers first
-            if hasattr(expression_group, "_layers"):
-                for expr_layer in expression_group._layers:
-                    expr_layer.visible = False
-
-            # Find and enable the target expression
+            # Find the target expression
             target_expression = self.analyzer.get_layer_by_name(expression_name)
             if not target_expression:
-                logger.error(f"Expression '{expression_name}' not found")
+                logger.error("Expression '%s' not found", expression_name)
                 return None
 
-            # Enable the target expression
-            original_visibility = target_expression.visible
-            target_expression.visible = True
+            with self._expression_visibility(expression_group):
+                # Everything outside the expression layer looks the same for
+                # every expression, so the full canvas is only composited once
+                if self._base_composite is None:
+                    self._base_composite = self.psd.composite(
+                        layer_filter=_render_visible
+                    )
+
+                # Enable the target expression
+                original_visibility = target_expression.visible
+                target_expression.visible = True
 
-            try:
-                # Composite the entire image
-                composite_image = self.psd.composite()
-                logger.info(f"Successfully extracted expression: {expression_name}")
-                return composite_image
+                try:
+                    composite_image = self._composite_over_base(target_expression)
+                    logger.info(
+                        "Successfully extracted expression: %s", expression_name
+                    )
+                    return composite_image
 
-            finally:
-                # Restore original visibility
-                target_expression.visible = original_visibility
+                finally:
+                    # Restore original visibility
+                    target_expression.visible = original_visibility
 
         except Exception as e:
-            logger.error(f"Failed to extract expression '{expression_name}': {e}")
+            logger.error("Failed to extract expression '%s': %s", expression_name, e)
             return None
 
+    def _get_lineage_ids(self, layer) -> FrozenSet[int]:
+        """
+        Get the ids of a layer and all of its parent groups.
+
+        The parent chain is walked once per layer and remembered, so repeated
+        extractions of the same layer don't walk it again.
+
+        Args:
+            layer: Layer to walk up from
+
+        Returns:
+            Ids of the layer and its ancestors, including the PSD root
+        """
+        lineage = self._lineage_ids.get(id(layer))
+        if lineage is None:
+            ids = [id(layer)]
+            parent = getattr(layer, "parent", None)
+            while parent is not None:
+                ids.append(id(parent))
+                parent = getattr(parent, "parent", None)
+            lineage = self._lineage_ids[id(layer)] = frozenset(ids)
+        return lineage
+
+    def _only_layers_filter(self, layers: List[any]) -> Callable[[any], bool]:
+        """
+        Build a psd-tools layer filter that renders only the given layers.
+
+        The layers' parent groups are allowed as well, since psd-tools skips
+        the contents of any group the filter rejects.
+
+        Args:
+            layers: Layers to render
+
+        Returns:
+            Predicate for the layer_filter argument of composite()
+        """
+        if len(layers) == 1:
+            allowed = self._get_lineage_ids(layers[0])
+        else:
+            allowed = set()
+            for layer in layers:
+                allowed |= self._get_lineage_ids(layer)
+        return lambda layer: id(layer) in allowed
+
+    @contextmanager
+    def _expression_visibility(self, expression_group) -> Iterator[None]:
+        """
+        Hide every layer in the expression group, restoring them on exit.
+
+        Nested uses share the outermost snapshot, so extracting several
+        expressions records and restores the layer states only once and the
+        caller's PSD is left as it was found.
+
+        Args:
+            expression_group: The expression group layer
+        """
+        if self._expressions_hidden:
+            yield
+            return
+
+        snapshot = [
+            (layer, layer.visible) for layer in getattr(expression_group, "_layers", ())
+        ]
+        for layer, _ in snapshot:
+            layer.visible = False
+
+        self._expressions_hidden = True
+        try:
+            yield
+        finally:
+            self._expressions_hidden = False
+            for layer, visible in snapshot:
+                layer.visible = visible
+
+    def _composite_over_base(self, layer) -> Optional[any]:
+        """
+        Composite the PSD by re-rendering only the area covered by a layer.
+
+        The region is composited with the full layer stack (so layers above
+        the expression and blend modes still apply) and pasted onto a copy of
+        the cached base composite.
+
+        Args:
+            layer: The visible expression layer
+
+        Returns:
+            PIL Image of the full canvas
+        """
+        left, top, right, bottom = layer.bbox
+        left, top = max(left, 0), max(top, 0)
+        right, bottom = min(right, self.psd.width), min(bottom, self.psd.height)
+        if right <= left or bottom <= top:
+            # Empty layer, nothing differs from the base
+            return self._base_composite.copy()
+
+        region = self.psd.composite(
+            viewport=(left, top, right, bottom), layer_filter=_render_visible
+        )
+        composite_image = self._base_composite.copy()
+        composite_image.paste(region, (left, top))
+        return composite_image
+
     def extract_component(self, component_name: str) -> Optional[any]:
         """
         Extract a single component from the PSD.
@@ -364,66 +623,36 @@ class CharacterExtractor:
             # Find the target component
             target_component = self.analyzer.get_layer_by_name(component_name)
             if not target_component:
-                logger.error(f"Component '{component_name}' not found")
+                logger.error("Component '%s' not found", component_name)
                 return None
 
-            # Save original visibility states
-            original_visibility = {}
-            all_layers = list(self.psd.descendants())
-
-            for layer in all_layers:
-                if hasattr(layer, "visible"):
-                    original_visibility[layer.name] = layer.visible
-
-            try:
-                # Hide all layers first
-                for layer in all_layers:
-                    if hasattr(layer, "visible"):
-                        layer.visible = False
-
-                # Show only the target component
-                target_component.visible = True
-
-                # For component extraction, we might need to show related base layers
-                # Show body/base layers if extracting clothing/accessories
-                extractable_components = self.get_extractable_components()
-                target_category = None
-
-                for comp in extractable_components:
-                    if comp["name"] == component_name:
-                        target_category = comp["category"]
-                        break
-
-                # Show base layers for proper context
-                if target_category in ["clothing", "accessories", "shoes", "bottom"]:
-                    for layer in all_layers:
-                        if hasattr(layer, "visible") and hasattr(layer, "name"):
-                            layer_name_lower = layer.name.lower()
-                            if any(
-                                keyword in layer_name_lower
-                                for keyword in ["body", "base", "skin"]
-                            ):
-                                layer.visible = True
-
-                # Composite the image
-                composite_image = self.psd.composite()
-                logger.info(f"Successfully extracted component: {component_name}")
-                return composite_image
-
-            finally:
-                # Restore original visibility states
-                for layer in all_layers:
-                    if hasattr(layer, "visible") and layer.name in original_visibility:
-                        layer.visible = original_visibility[layer.name]
+            # Show only the target component
+            visible_layers = [target_component]
+
+            # For component extraction, we might need to show related base layers
+            # Show body/base layers if extracting clothing/accessories
+            target_category = self._get_component_category(component_name)
+
+            # Show base layers for proper context
+            if target_category in self.BASE_CONTEXT_CATEGORIES:
+                visible_layers.extend(self._get_base_layers())
+
+            # Composite the image
+            composite_image = self.psd.composite(
+                layer_filter=self._only_layers_filter(visible_layers)
+            )
+            logger.info("Successfully extracted component: %s", component_name)
+            return composite_image
 
         except Exception as e:
-            logger.error(f"Failed to extract component '{component_name}': {e}")
+            logger.error("Failed to extract component '%s': %s", component_name, e)
             return None
 
     def extract_expressions(
         self,
         custom_mapping: Optional[Dict[str, List[str]]] = None,
         target_states: Optional[List[str]] = None,
+        workers: Optional[int] = 1,
     ) -> Dict[str, any]:
         """
         Extract multiple expressions mapped to lip sync states.
@@ -431,6 +660,8 @@ class CharacterExtractor:
         Args:
             custom_mapping: Optional custom expression mapping
             target_states: Optional list of specific states to extract
+            workers: Number of processes compositing states in parallel (None
+                uses one per state, up to the CPU count; 1 runs serially)
 
         Returns:
             Dictionary mapping lip sync states to PIL Images
@@ -438,58 +669,218 @@ class CharacterExtractor:
         mapping = custom_mapping or self.expression_mapping
         states_to_extract = target_states or list(mapping.keys())
 
-        extracted_expressions = {}
-
+        valid_states = []
         for sync_state in states_to_extract:
             if sync_state not in mapping:
-                logger.warning(f"Sync state '{sync_state}' not found in mapping")
+                logger.warning("Sync state '%s' not found in mapping", sync_state)
                 continue
+            valid_states.append(sync_state)
+
+        # Names with no layer in the PSD can only fail, so they are dropped up
+        # front with the analyzer's name index instead of attempted one by one
+        candidates = {
+            state: [
+                name
+                for name in mapping[state]
+                if self.analyzer.get_layer_by_name(name) is not None
+            ]
+            for state in valid_states
+        }
 
-            expression_names = mapping[sync_state]
-            logger.info(f"Extracting for lip sync state: {sync_state}")
+        workers = self._resolve_workers(workers, len(valid_states))
 
-            # Try each expression in the mapping until one succeeds
-            extracted = False
-            for expression_name in expression_names:
-                image = self.extract_expression(expression_name)
-                if image is not None:
-                    extracted_expressions[sync_state] = image
-                    logger.info(f"  ✓ Used '{expression_name}' for {sync_state} state")
-                    extracted = True
-                    break
-                else:
-                    logger.warning(f"  ✗ Failed to extract '{expression_name}'")
-
-            if not extracted:
+        if workers > 1:
+            # Each composite is independent, so states are spread over processes
+            results = self._map_in_processes(
+                _extract_state_in_process,
+                workers,
+                valid_states,
+                [candidates[state] for state in valid_states],
+            )
+        else:
+            # States often share fallback names, so each expression is only
+            # composited once per run
+            composite_cache = {}
+
+            # Hide the expression layers once for the whole run
+            with self._expression_visibility(self.analyzer.get_expression_group()):
+                results = [
+                    self._extract_state(state, candidates[state], composite_cache)
+                    for state in valid_states
+                ]
+
+        extracted_expressions = {}
+
+        for sync_state, (expression_name, image) in zip(valid_states, results):
+            if image is not None:
+                extracted_expressions[sync_state] = image
+                logger.info("  ✓ Used '%s' for %s state", expression_name, sync_state)
+            else:
                 logger.warning(
-                    f"  ⚠ No suitable expression found for {sync_state} state"
+                    "  ⚠ No suitable expression found for %s state", sync_state
                 )
 
         logger.info(
-            f"Successfully extracted {len(extracted_expressions)}/{len(states_to_extract)} expressions"
+            "Successfully extracted %s/%s expressions",
+            len(extracted_expressions),
+            len(states_to_extract),
         )
         return extracted_expressions
 
-    def extract_all_expressions(self) -> Dict[str, any]:
+    def _resolve_workers(self, workers: Optional[int], task_count: int) -> int:
+        """
+        Work out how many processes to use for a set of extractions.
+
+        Args:
+            workers: Requested process count (None for one per task, up to
+                the CPU count)
+            task_count: Number of independent extractions
+
+        Returns:
+            Number of processes to use, 1 meaning run serially
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        return max(1, min(workers, task_count))
+
+    def _map_in_processes(self, func, workers: int, *iterables) -> List[any]:
+        """
+        Run an extraction function over its arguments in worker processes.
+
+        Every worker opens the PSD once and reuses it for all of its tasks.
+
+        Args:
+            func: Module-level worker function
+            workers: Number of processes
+            *iterables: Argument iterables, as for map()
+
+        Returns:
+            List of results in argument order
+        """
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_extraction_worker,
+            initargs=(self.psd_path,),
+        ) as executor:
+            return list(executor.map(func, *iterables))
+
+    def _extract_state(
+        self,
+        sync_state: str,
+        expression_names: List[str],
+        composite_cache: Optional[Dict[str, any]] = None,
+    ) -> Tuple[Optional[str], Optional[any]]:
+        """
+        Extract the first available expression for a lip sync state.
+
+        Args:
+            sync_state: Lip sync state being extracted
+            expression_names: Candidate expression layer names, in priority order
+            composite_cache: Optional dict of expression results already
+                extracted in this run, updated with new results
+
+        Returns:
+            Tuple of (expression name used, PIL Image), or (None, None)
+        """
+        logger.info("Extracting for lip sync state: %s", sync_state)
+
+        # Try each expression in the mapping until one succeeds
+        for expression_name in expression_names:
+            if composite_cache is not None and expression_name in composite_cache:
+                image = composite_cache[expression_name]
+                if image is not None:
+                    # Copy so states sharing an expression get separate images
+                    return expression_name, image.copy()
+                continue
+
+            image = self.extract_expression(expression_name)
+            if composite_cache is not None:
+                composite_cache[expression_name] = image
+            if image is not None:
+                return expression_name, image
+            logger.warning("  ✗ Failed to extract '%s'", expression_name)
+
+        return None, None
+
+    def extract_all_expressions(self, workers: Optional[int] = 1) -> Dict[str, any]:
         """
         Extract all available expressions from the PSD.
 
+        Args:
+            workers: Number of processes compositing expressions in parallel
+                (None uses up to the CPU count; 1 runs serially)
+
         Returns:
             Dictionary mapping expression names to PIL Images
         """
         available_expressions = self.get_available_expressions()
-        extracted = {}
+        workers = self._resolve_workers(workers, len(available_expressions))
 
-        for expr_name in available_expressions:
-            image = self.extract_expression(expr_name)
-            if image is not None:
-                extracted[expr_name] = image
+        if workers > 1:
+            images = self._map_in_processes(
+                _extract_expression_in_process, workers, available_expressions
+            )
+            extracted = {
+                name: image
+                for name, image in zip(available_expressions, images)
+                if image is not None
+            }
+        else:
+            extracted = self.extract_expressions_by_name(available_expressions)
 
         logger.info(
-            f"Extracted {len(extracted)}/{len(available_expressions)} available expressions"
+            "Extracted %s/%s available expressions",
+            len(extracted),
+            len(available_expressions),
         )
         return extracted
 
+    def extract_expressions_by_name(
+        self, expression_names: List[str]
+    ) -> Dict[str, any]:
+        """
+        Extract several expressions in one pass over the expression group.
+
+        The expression layers are hidden once up front and only the target
+        layer is toggled for each composite.
+
+        Args:
+            expression_names: Names of the expression layers to extract
+
+        Returns:
+            Dictionary mapping expression names to PIL Images, omitting any
+            that could not be extracted
+        """
+        return dict(self.iter_expressions(expression_names))
+
+    def iter_expressions(
+        self, expression_names: Optional[List[str]] = None
+    ) -> Iterator[Tuple[str, any]]:
+        """
+        Extract expressions one at a time, yielding each as it is composited.
+
+        Unlike the dict-returning methods, only the image being handled is
+        kept alive, so this is preferred for PSDs with many large expressions.
+        The expression layers stay hidden until the iterator is exhausted or
+        closed.
+
+        Args:
+            expression_names: Names of the expression layers to extract
+                (defaults to every available expression)
+
+        Yields:
+            Tuples of (expression name, PIL Image), skipping any that could
+            not be extracted
+        """
+        if expression_names is None:
+            expression_names = self.get_available_expressions()
+
+        with self._expression_visibility(self.analyzer.get_expression_group()):
+            for expr_name in expression_names:
+                image = self.extract_expression(expr_name)
+                if image is not None:
+                    yield expr_name, image
+
     def extract_components_by_category(self, category: str) -> Dict[str, any]:
         """
         Extract all components in a specific category.
@@ -511,40 +902,57 @@ class CharacterExtractor:
                     extracted[component_name] = image
 
         logger.info(
-            f"Extracted {len(extracted)}/{len(components)} components from category '{category}'"
+            "Extracted %s/%s components from category '%s'",
+            len(extracted),
+            len(components),
+            category,
         )
         return extracted
 
-    def extract_all_components(self) -> Dict[str, Dict[str, any]]:
+    def extract_all_components(
+        self, workers: Optional[int] = 1
+    ) -> Dict[str, Dict[str, any]]:
         """
         Extract all available components organized by category.
 
+        Args:
+            workers: Number of processes compositing components in parallel
+                (None uses up to the CPU count; 1 runs serially)
+
         Returns:
             Dictionary mapping categories to dictionaries of component names and PIL Images
         """
         all_components = self.get_all_components()
         extracted_by_category = {}
 
-        for category, components in all_components.items():
-            category_extracted = {}
-
-            for component in components:
-                if component["type"] == "LAYER":  # Only extract individual layers
-                    component_name = component["name"]
-                    image = self.extract_component(component_name)
-                    if image is not None:
-                        category_extracted[component_name] = image
+        # Only extract individual layers
+        tasks = [
+            (category, component["name"])
+            for category, components in all_components.items()
+            for component in components
+            if component["type"] == "LAYER"
+        ]
+        names = [component_name for _, component_name in tasks]
+        workers = self._resolve_workers(workers, len(tasks))
+
+        if workers > 1:
+            images = self._map_in_processes(
+                _extract_component_in_process, workers, names
+            )
+        else:
+            images = [self.extract_component(name) for name in names]
 
-            if (
-                category_extracted
-            ):  # Only include categories with successful extractions
-                extracted_by_category[category] = category_extracted
+        for (category, component_name), image in zip(tasks, images):
+            if image is not None:
+                extracted_by_category.setdefault(category, {})[component_name] = image
 
         total_extracted = sum(
             len(category_dict) for category_dict in extracted_by_category.values()
         )
         logger.info(
-            f"Extracted {total_extracted} components across {len(extracted_by_category)} categories"
+            "Extracted %s components across %s categories",
+            total_extracted,
+            len(extracted_by_category),
         )
         return extracted_by_category
 
@@ -570,29 +978,74 @@ class CharacterExtractor:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
+        output_dir_str = str(output_path)
+        jobs = [
+            (
+                expr_name,
+                image,
+                os.path.join(output_dir_str, f"{prefix}-{expr_name}.png"),
+            )
+            for expr_name, image in expressions.items()
+            if image is not None
+        ]
+
         saved_files = {}
 
-        for expr_name, image in expressions.items():
-            if image is None:
-                continue
+        if jobs:
+            # PNG encoding releases the GIL, so files are encoded concurrently
+            with ThreadPoolExecutor(
+                max_workers=min(self.MAX_SAVE_WORKERS, len(jobs))
+            ) as executor:
+                saved_paths = list(
+                    executor.map(lambda job: self._save_image(*job, optimize), jobs)
+                )
 
-            filename = f"{prefix}-{expr_name}.png"
-            file_path = output_path / filename
+            for (expr_name, _, _), file_path in zip(jobs, saved_paths):
+                if file_path is not None:
+                    saved_files[expr_name] = file_path
+
+        logger.info("Saved %s expression files to %s", len(saved_files), output_dir)
+        return saved_files
 
-            if optimize:
+    def _save_image(
+        self, expr_name: str, image: any, file_path: str, optimize: bool
+    ) -> Optional[str]:
+        """
+        Optionally optimize and save one extracted image as PNG.
+
+        Args:
+            expr_name: Expression or state name (for logging)
+            image: PIL Image to save
+            file_path: Output file path
+            optimize: Whether to optimize the image for web first
+
+        Returns:
+            The saved file path, or None if saving failed
+        """
+        try:
+            if optimize and self.optimizer.needs_optimization(image):
                 # Apply optimization before saving
                 image = self.optimizer.optimize_for_web(image)
 
-            try:
-                image.save(str(file_path), "PNG")
-                saved_files[expr_name] = str(file_path)
-                logger.info(f"Saved: {file_path}")
+            if image.mode == "RGBA" and image.getextrema()[3] == (255, 255):
+                # Fully opaque, so the alpha plane would only add encode work
+                image = image.convert("RGB")
 
-            except Exception as e:
-                logger.error(f"Failed to save {expr_name}: {e}")
+            if pyspng is not None and image.mode in ("RGB", "RGBA"):
+                # pyspng's encoder is several times faster than PIL's PNG writer
+                data = pyspng.encode(
+                    np.asarray(image), compress_level=self.PNG_COMPRESS_LEVEL
+                )
+                with open(file_path, "wb") as f:
+                    f.write(data)
+            else:
+                image.save(file_path, "PNG")
+            logger.info("Saved: %s", file_path)
+            return file_path
 
-        logger.info(f"Saved {len(saved_files)} expression files to {output_dir}")
-        return saved_files
+        except Exception as e:
+            logger.error("Failed to save %s: %s", expr_name, e)
+            return None
 
     def extract_and_save(
         self,
@@ -616,6 +1069,46 @@ class CharacterExtractor:
         expressions = self.extract_expressions(custom_mapping)
         return self.save_expressions(expressions, output_dir, optimize, prefix)
 
+    def extract_all_and_save(
+        self,
+        output_dir: str,
+        optimize: bool = True,
+        prefix: str = "character",
+    ) -> Dict[str, str]:
+        """
+        Extract every available expression and save each as it is produced.
+
+        Images are streamed from iter_expressions and released once written,
+        so memory use stays at about one image regardless of how many
+        expressions the PSD has.
+
+        Args:
+            output_dir: Directory to save images
+            optimize: Whether to optimize images for web
+            prefix: Prefix for output filenames
+
+        Returns:
+            Dictionary mapping expression names to saved file paths
+        """
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        output_dir_str = str(output_path)
+
+        saved_files = {}
+
+        for expr_name, image in self.iter_expressions():
+            file_path = self._save_image(
+                expr_name,
+                image,
+                os.path.join(output_dir_str, f"{prefix}-{expr_name}.png"),
+                optimize,
+            )
+            if file_path is not None:
+                saved_files[expr_name] = file_path
+
+        logger.info("Saved %s expression files to %s", len(saved_files), output_dir)
+        return saved_files
+
     def get_extraction_summary(self) -> Dict[str, any]:
         """
         Get a summary of what can be extracted from this PSD.
@@ -626,28 +1119,29 @@ class CharacterExtractor:
         basic_info = self.analyzer.get_basic_info()
         available_expressions = self.get_available_expressions()
         all_components = self.get_all_components()
-        extractable_components = self.get_extractable_components()
+        # Derive the extractable subset from the same categorization instead
+        # of walking and categorizing the layer tree a second time
+        extractable_components = self.analyzer.get_extractable_components(
+            all_components
+        )
 
         # Check which expressions can be mapped
+        available_set = frozenset(available_expressions)
         mappable_states = {}
         for state, expr_names in self.expression_mapping.items():
-            found_expressions = [
-                name for name in expr_names if name in available_expressions
-            ]
+            found_expressions = [name for name in expr_names if name in available_set]
             if found_expressions:
                 mappable_states[state] = found_expressions
 
         # Component statistics
         component_stats = {}
         for category, components in all_components.items():
-            extractable_count = len([c for c in components if c["type"] == "LAYER"])
-            if extractable_count > 0:
+            layer_names = [c["name"] for c in components if c["type"] == "LAYER"]
+            if layer_names:
                 component_stats[category] = {
                     "total": len(components),
-                    "extractable": extractable_count,
-                    "components": [
-                        c["name"] for c in components if c["type"] == "LAYER"
-                    ],
+                    "extractable": len(layer_names),
+                    "components": layer_names,
                 }
 
         return {
@@ -6,8 +6,9 @@ Builds expression state machines for avatar animation.
 
 import json
 import logging
+from dataclasses import replace
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional
 
 from .models.avatar import AvatarBundle
 from .models.graph import ExpressionGraph, GraphEdge, GraphNode, GraphParams, SlotState
@@ -27,6 +28,36 @@ class GraphBuilder:
         """
         self.avatar = avatar_bundle
 
+        # Slot states/emotions/shapes as sets, built once so the node builders
+        # don't rescan the slot definitions for every expression they add
+        self._slot_caps: Dict[str, Dict[str, FrozenSet[str]]] = {
+            slot_name: {
+                "states": frozenset(slot.states or ()),
+                "emotions": frozenset(slot.emotions or ()),
+                "shapes": frozenset(slot.shapes or ()),
+            }
+            for slot_name, slot in self.avatar.slots.items()
+        }
+
+        # Idle-talk templates shared by both presets, built on first use
+        self._idle_nodes: Optional[Dict[str, GraphNode]] = None
+        self._idle_edges: Optional[List[GraphEdge]] = None
+
+    def _slot_supports(self, slot_name: str, kind: str, value: str) -> bool:
+        """
+        Check whether an avatar slot offers a state, emotion, or shape.
+
+        Args:
+            slot_name: Name of the slot (e.g. "Mouth")
+            kind: One of "states", "emotions", or "shapes"
+            value: Value to look for
+
+        Returns:
+            True if the slot exists and lists the value
+        """
+        caps = self._slot_caps.get(slot_name)
+        return caps is not None and value in caps[kind]
+
     def build_idle_talk_graph(self) -> ExpressionGraph:
         """
         Build a basic idle-talk expression graph.
@@ -74,7 +105,32 @@ class GraphBuilder:
         return graph
 
     def _build_idle_talk_nodes(self) -> Dict[str, GraphNode]:
-        """Build basic idle-talk nodes."""
+        """
+        Build basic idle-talk nodes.
+
+        The nodes are only built once per builder, and every call gets its own
+        copies of the nodes and their slot states, so graphs built later are
+        not affected by edits to earlier ones.
+
+        Returns:
+            Dictionary mapping node names to nodes
+        """
+        if self._idle_nodes is None:
+            self._idle_nodes = self._create_idle_talk_nodes()
+
+        return {
+            name: GraphNode(
+                slots={
+                    slot_name: replace(slot_state)
+                    for slot_name, slot_state in node.slots.items()
+                },
+                duration=list(node.duration) if node.duration else node.duration,
+            )
+            for name, node in self._idle_nodes.items()
+        }
+
+    def _create_idle_talk_nodes(self) -> Dict[str, GraphNode]:
+        """Create the idle-talk node templates."""
         nodes = {}
 
         # Idle neutral state
@@ -109,7 +165,27 @@ class GraphBuilder:
         return nodes
 
     def _build_idle_talk_edges(self) -> List[GraphEdge]:
-        """Build basic idle-talk edges."""
+        """
+        Build basic idle-talk edges.
+
+        Like the nodes, the edges are built once and copied for each graph.
+
+        Returns:
+            List of idle-talk edges
+        """
+        if self._idle_edges is None:
+            self._idle_edges = self._create_idle_talk_edges()
+
+        return [
+            replace(
+                edge,
+                after=list(edge.after) if isinstance(edge.after, list) else edge.after,
+            )
+            for edge in self._idle_edges
+        ]
+
+    def _create_idle_talk_edges(self) -> List[GraphEdge]:
+        """Create the idle-talk edge templates."""
         edges = []
 
         # Idle to blink (random)
@@ -159,70 +235,40 @@ class GraphBuilder:
         """Build emotion-aware nodes."""
         nodes = self._build_idle_talk_nodes()  # Start with basic nodes
 
-        # Add emotional variations
-        base_slots = {}
-        if "Mouth" in self.avatar.slots:
-            base_slots["Mouth"] = SlotState(viseme="REST")
-        if "EyeL" in self.avatar.slots:
-            base_slots["EyeL"] = SlotState(state="open")
-        if "EyeR" in self.avatar.slots:
-            base_slots["EyeR"] = SlotState(state="open")
+        # Add emotional variations on top of the idle neutral face
+        base_slots = nodes["IdleNeutral"].slots
 
         # Happy/smile state
         smile_slots = base_slots.copy()
-        if "Mouth" in self.avatar.slots:
-            # Check if emotion is available
-            mouth_slot = self.avatar.slots["Mouth"]
-            if mouth_slot.emotions and "smile" in mouth_slot.emotions:
-                smile_slots["Mouth"] = SlotState(emotion="smile")
+        if self._slot_supports("Mouth", "emotions", "smile"):
+            smile_slots["Mouth"] = SlotState(emotion="smile")
 
-        if "BrowL" in self.avatar.slots:
-            brow_slot = self.avatar.slots["BrowL"]
-            if brow_slot.shapes and "up" in brow_slot.shapes:
-                smile_slots["BrowL"] = SlotState(shape="up")
-
-        if "BrowR" in self.avatar.slots:
-            brow_slot = self.avatar.slots["BrowR"]
-            if brow_slot.shapes and "up" in brow_slot.shapes:
-                smile_slots["BrowR"] = SlotState(shape="up")
+        for brow in ("BrowL", "BrowR"):
+            if self._slot_supports(brow, "shapes", "up"):
+                smile_slots[brow] = SlotState(shape="up")
 
         nodes["Smile"] = GraphNode(slots=smile_slots)
 
         # Sad state
         sad_slots = base_slots.copy()
-        if "Mouth" in self.avatar.slots:
-            mouth_slot = self.avatar.slots["Mouth"]
-            if mouth_slot.emotions and "sad" in mouth_slot.emotions:
-                sad_slots["Mouth"] = SlotState(emotion="sad")
-
-        if "EyeL" in self.avatar.slots:
-            eye_slot = self.avatar.slots["EyeL"]
-            if eye_slot.states and "sad" in eye_slot.states:
-                sad_slots["EyeL"] = SlotState(state="sad")
+        if self._slot_supports("Mouth", "emotions", "sad"):
+            sad_slots["Mouth"] = SlotState(emotion="sad")
 
-        if "EyeR" in self.avatar.slots:
-            eye_slot = self.avatar.slots["EyeR"]
-            if eye_slot.states and "sad" in eye_slot.states:
-                sad_slots["EyeR"] = SlotState(state="sad")
+        for eye in ("EyeL", "EyeR"):
+            if self._slot_supports(eye, "states", "sad"):
+                sad_slots[eye] = SlotState(state="sad")
 
         nodes["Sad"] = GraphNode(slots=sad_slots)
 
         # Surprised state
         surprised_slots = base_slots.copy()
-        if "EyeL" in self.avatar.slots:
-            surprised_slots["EyeL"] = SlotState(state="open")  # Wide open
-        if "EyeR" in self.avatar.slots:
-            surprised_slots["EyeR"] = SlotState(state="open")
-
-        if "BrowL" in self.avatar.slots:
-            brow_slot = self.avatar.slots["BrowL"]
-            if brow_slot.shapes and "up" in brow_slot.shapes:
-                surprised_slots["BrowL"] = SlotState(shape="up")
+        for eye in ("EyeL", "EyeR"):
+            if eye in self._slot_caps:
+                surprised_slots[eye] = SlotState(state="open")  # Wide open
 
-        if "BrowR" in self.avatar.slots:
-            brow_slot = self.avatar.slots["BrowR"]
-            if brow_slot.shapes and "up" in brow_slot.shapes:
-                surprised_slots["BrowR"] = SlotState(shape="up")
+        for brow in ("BrowL", "BrowR"):
+            if self._slot_supports(brow, "shapes", "up"):
+                surprised_slots[brow] = SlotState(shape="up")
 
         nodes["Surprised"] = GraphNode(slots=surprised_slots)
 
@@ -6,12 +6,19 @@ Handles phoneme-to-viseme mapping and animation scheduling for speaking avatars.
 
 import logging
 import re
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, replace
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Slotted dataclasses (Python 3.10+) make the many small frame objects cheaper
+# to create and store; older versions fall back to regular dataclasses
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class VisemeType(Enum):
     """Standard viseme types for lip sync animation."""
@@ -28,7 +35,7 @@ class VisemeType(Enum):
     REST = "REST"  # Rest/neutral position
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class VisemeFrame:
     """A single viseme frame with timing information."""
 
@@ -124,6 +131,14 @@ class PhonemeMapper:
                 except ValueError:
                     logger.warning(f"Unknown viseme type: {viseme_str}")
 
+        # Keep lower-case aliases (e.g. "sil") in step with their upper-case
+        # entries, so a direct lookup always agrees with the upper-cased one
+        for phoneme in self.mapping:
+            if phoneme != phoneme.upper():
+                self.mapping[phoneme] = self.mapping.get(
+                    phoneme.upper(), VisemeType.REST
+                )
+
     def map_phoneme(self, phoneme: str) -> VisemeType:
         """
         Map a single phoneme to a viseme.
@@ -134,8 +149,12 @@ class PhonemeMapper:
         Returns:
             VisemeType corresponding to the phoneme
         """
-        phoneme_upper = phoneme.upper()
-        return self.mapping.get(phoneme_upper, VisemeType.REST)
+        # Most phonemes already come upper-case, so try them as-is first and
+        # only allocate an upper-cased copy when that misses
+        viseme = self.mapping.get(phoneme)
+        if viseme is None:
+            viseme = self.mapping.get(phoneme.upper(), VisemeType.REST)
+        return viseme
 
     def map_phoneme_sequence(
         self, phonemes: List[Tuple[str, float, float]]
@@ -150,9 +169,13 @@ class PhonemeMapper:
             List of VisemeFrame objects
         """
         frames = []
+        lookup = self.mapping.get
+        rest = VisemeType.REST
 
         for phoneme, start_time, duration in phonemes:
-            viseme = self.map_phoneme(phoneme)
+            viseme = lookup(phoneme)
+            if viseme is None:
+                viseme = lookup(phoneme.upper(), rest)
             frame = VisemeFrame(viseme=viseme, start_time=start_time, duration=duration)
             frames.append(frame)
 
@@ -162,6 +185,36 @@ class PhonemeMapper:
 class LipsyncPipeline:
     """Main lipsync pipeline for processing text/audio to viseme animations."""
 
+    # Character-to-viseme lookup for text processing; other characters rest
+    CHAR_VISEME_MAPPING = {
+        "a": VisemeType.AI,
+        "i": VisemeType.AI,
+        "e": VisemeType.E,
+        "u": VisemeType.U,
+        "o": VisemeType.O,
+        "f": VisemeType.FV,
+        "v": VisemeType.FV,
+        "l": VisemeType.L,
+        "w": VisemeType.WQ,
+        "r": VisemeType.WQ,
+        "m": VisemeType.MBP,
+        "b": VisemeType.MBP,
+        "p": VisemeType.MBP,
+    }
+
+    # Rhubarb mouth shape mapping (A-H, X)
+    RHUBARB_VISEME_MAPPING = {
+        "A": VisemeType.REST,  # Closed mouth
+        "B": VisemeType.MBP,  # M, B, P sounds
+        "C": VisemeType.AI,  # Open vowels
+        "D": VisemeType.AI,  # More open vowels
+        "E": VisemeType.E,  # E vowel
+        "F": VisemeType.FV,  # F, V sounds
+        "G": VisemeType.U,  # U vowel
+        "H": VisemeType.L,  # L sound
+        "X": VisemeType.REST,  # Silence/rest
+    }
+
     def __init__(self, phoneme_mapper: Optional[PhonemeMapper] = None):
         """
         Initialize lipsync pipeline.
@@ -229,31 +282,32 @@ class LipsyncPipeline:
         Returns:
             LipsyncData with precise timing from audio analysis
         """
-        frames = []
-
         # Parse Rhubarb mouth cues
         mouth_cues = rhubarb_data.get("mouthCues", [])
+        start_times = np.fromiter(
+            (cue.get("start", 0.0) for cue in mouth_cues),
+            dtype=np.float64,
+            count=len(mouth_cues),
+        )
 
-        for cue in mouth_cues:
-            start_time = cue.get("start", 0.0)
-            value = cue.get("value", "X")  # Rhubarb uses A, B, C, D, E, F, G, H, X
-
-            # Map Rhubarb mouth shapes to visemes
-            viseme = self._rhubarb_to_viseme(value)
-
-            # Calculate duration (use next cue's start time, or default)
-            duration = 0.1  # Default frame duration
-
-            frame = VisemeFrame(viseme=viseme, start_time=start_time, duration=duration)
-            frames.append(frame)
-
-        # Calculate actual durations
-        for i, frame in enumerate(frames):
-            if i < len(frames) - 1:
-                frame.duration = frames[i + 1].start_time - frame.start_time
-            else:
-                # Last frame duration
-                frame.duration = 0.1
+        # Each cue lasts until the next one starts; the last gets a default
+        durations = np.empty_like(start_times)
+        durations[:-1] = np.diff(start_times)
+        durations[-1:] = 0.1
+
+        # Map Rhubarb mouth shapes (A, B, C, D, E, F, G, H, X) to visemes
+        lookup = self.RHUBARB_VISEME_MAPPING.get
+        rest = VisemeType.REST
+        frames = [
+            VisemeFrame(
+                viseme=lookup(cue.get("value", "X").upper(), rest),
+                start_time=start_time,
+                duration=duration,
+            )
+            for cue, start_time, duration in zip(
+                mouth_cues, start_times.tolist(), durations.tolist()
+            )
+        ]
 
         total_duration = frames[-1].start_time + frames[-1].duration if frames else 0.0
 
@@ -269,34 +323,10 @@ class LipsyncPipeline:
         Returns:
             List of visemes for the word
         """
-        visemes = []
-        word = word.lower()
-
-        # Very basic vowel/consonant detection
-        for char in word:
-            if char in "aeiou":
-                if char in "ai":
-                    visemes.append(VisemeType.AI)
-                elif char == "e":
-                    visemes.append(VisemeType.E)
-                elif char == "u":
-                    visemes.append(VisemeType.U)
-                elif char == "o":
-                    visemes.append(VisemeType.O)
-                else:
-                    visemes.append(VisemeType.AI)
-            elif char in "fv":
-                visemes.append(VisemeType.FV)
-            elif char == "l":
-                visemes.append(VisemeType.L)
-            elif char in "wr":
-                visemes.append(VisemeType.WQ)
-            elif char in "mbp":
-                visemes.append(VisemeType.MBP)
-            else:
-                visemes.append(VisemeType.REST)
-
-        return visemes
+        # Very basic vowel/consonant detection, one table lookup per character
+        lookup = self.CHAR_VISEME_MAPPING.get
+        rest = VisemeType.REST
+        return [lookup(char, rest) for char in word.lower()]
 
     def _rhubarb_to_viseme(self, rhubarb_shape: str) -> VisemeType:
         """
@@ -308,20 +338,7 @@ class LipsyncPipeline:
         Returns:
             Corresponding VisemeType
         """
-        # Rhubarb shape mapping
-        rhubarb_mapping = {
-            "A": VisemeType.REST,  # Closed mouth
-            "B": VisemeType.MBP,  # M, B, P sounds
-            "C": VisemeType.AI,  # Open vowels
-            "D": VisemeType.AI,  # More open vowels
-            "E": VisemeType.E,  # E vowel
-            "F": VisemeType.FV,  # F, V sounds
-            "G": VisemeType.U,  # U vowel
-            "H": VisemeType.L,  # L sound
-            "X": VisemeType.REST,  # Silence/rest
-        }
-
-        return rhubarb_mapping.get(rhubarb_shape.upper(), VisemeType.REST)
+        return self.RHUBARB_VISEME_MAPPING.get(rhubarb_shape.upper(), VisemeType.REST)
 
     def optimize_viseme_sequence(
         self, frames: List[VisemeFrame], min_duration: float = 0.05
@@ -341,25 +358,34 @@ class LipsyncPipeline:
 
         optimized = []
         current_frame = frames[0]
+        # Merged length is tracked here instead of being added onto the input
+        # frame, so only frames that actually absorbed others are copied
+        duration = current_frame.duration
+        merged = False
 
-        for i in range(1, len(frames)):
-            next_frame = frames[i]
-
+        for next_frame in frames[1:]:
             # Merge very short frames with the same viseme
-            if (
-                current_frame.viseme == next_frame.viseme
-                and current_frame.duration < min_duration
-            ):
-                current_frame.duration += next_frame.duration
-            else:
-                # Add current frame if it meets minimum duration
-                if current_frame.duration >= min_duration:
-                    optimized.append(current_frame)
-                current_frame = next_frame
+            if current_frame.viseme == next_frame.viseme and duration < min_duration:
+                duration += next_frame.duration
+                merged = True
+                continue
+
+            # Add current frame if it meets minimum duration
+            if duration >= min_duration:
+                optimized.append(
+                    replace(current_frame, duration=duration)
+                    if merged
+                    else current_frame
+                )
+            current_frame = next_frame
+            duration = next_frame.duration
+            merged = False
 
         # Add the last frame
-        if current_frame.duration >= min_duration:
-            optimized.append(current_frame)
+        if duration >= min_duration:
+            optimized.append(
+                replace(current_frame, duration=duration) if merged else current_frame
+            )
 
         return optimized
 
@@ -377,14 +403,26 @@ class LipsyncPipeline:
         """
         keyframes = []
 
-        for frame in lipsync_data.frames:
-            keyframe = {
-                "time": frame.start_time,
-                "duration": frame.duration,
-                "viseme": frame.viseme.value,
-                "confidence": frame.confidence,
-                "slot_states": {"Mouth": {"viseme": frame.viseme.value}},
+        # Keyframe layout per viseme; the per-frame fields are filled in below
+        templates = {
+            viseme: {
+                "time": 0.0,
+                "duration": 0.0,
+                "viseme": viseme.value,
+                "confidence": 1.0,
+                "slot_states": None,
             }
+            for viseme in VisemeType
+        }
+
+        for frame in lipsync_data.frames:
+            # Copy the viseme's template and fill in the per-frame values; the
+            # slot states are nested, so each keyframe gets its own dicts
+            keyframe = templates[frame.viseme].copy()
+            keyframe["time"] = frame.start_time
+            keyframe["duration"] = frame.duration
+            keyframe["confidence"] = frame.confidence
+            keyframe["slot_states"] = {"Mouth": {"viseme": keyframe["viseme"]}}
             keyframes.append(keyframe)
 
         return keyframes
@@ -416,32 +454,41 @@ class EmotionModulator:
         Returns:
             Modulated lipsync data
         """
-        modulated_frames = []
-
-        for frame in lipsync_data.frames:
-            modulated_frame = VisemeFrame(
-                viseme=frame.viseme,
-                start_time=frame.start_time,
-                duration=frame.duration,
-                confidence=frame.confidence,
-            )
-
-            # Apply emotion-based modifications
+        # The modulation only depends on the viseme, so work out each viseme's
+        # (valence, arousal) duration factors once instead of per frame
+        factors = {}
+        for viseme in VisemeType:
+            valence_factor = 1.0
             if valence > 0.5:  # Happy/positive
                 # Slightly extend vowel sounds for more expression
-                if frame.viseme in [VisemeType.AI, VisemeType.E, VisemeType.O]:
-                    modulated_frame.duration *= 1.1
+                if viseme in (VisemeType.AI, VisemeType.E, VisemeType.O):
+                    valence_factor = 1.1
 
             elif valence < -0.5:  # Sad/negative
                 # Slightly compress sounds for subdued effect
-                modulated_frame.duration *= 0.9
+                valence_factor = 0.9
 
+            arousal_factor = 1.0
             if arousal > 0.7:  # High arousal/excited
                 # Faster speech, shorter pauses
-                if frame.viseme == VisemeType.REST:
-                    modulated_frame.duration *= 0.7
+                if viseme == VisemeType.REST:
+                    arousal_factor = 0.7
+
+            factors[viseme] = (valence_factor, arousal_factor)
 
-            modulated_frames.append(modulated_frame)
+        modulated_frames = []
+
+        for frame in lipsync_data.frames:
+            valence_factor, arousal_factor = factors[frame.viseme]
+            modulated_frames.append(
+                VisemeFrame(
+                    viseme=frame.viseme,
+                    start_time=frame.start_time,
+                    # Applied one after the other, as separate adjustments
+                    duration=frame.duration * valence_factor * arousal_factor,
+                    confidence=frame.confidence,
+                )
+            )
 
         return LipsyncData(
             frames=modulated_frames,
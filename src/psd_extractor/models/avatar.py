@@ -2,7 +2,7 @@
 Avatar bundle data models.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -34,6 +34,17 @@ class SlotDefinition:
     emotions: Optional[List[str]] = None
     shapes: Optional[List[str]] = None
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SlotDefinition":
+        """Create a slot definition from its serialized (to_dict) form."""
+        try:
+            # Bundles written by AvatarBundle.to_dict only contain field keys
+            return cls(**data)
+        except TypeError:
+            # Ignore extra keys added by other tools
+            names = {f.name for f in fields(cls)}
+            return cls(**{key: value for key, value in data.items() if key in names})
+
 
 @dataclass
 class AvatarMeta:
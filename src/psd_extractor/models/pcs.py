@@ -3,9 +3,46 @@ PCS (PSD Convention Standard) data models.
 """
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+# Layer names come from user uploads, so keep the key caches bounded
+_KEY_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=_KEY_CACHE_SIZE)
+def _slot_key(part: Optional[str], side: Optional[str]) -> str:
+    """Build a slot key from the part/side fields of a tag."""
+    parts = []
+
+    if part:
+        parts.append(part)
+    if side:
+        parts.append(side)
+
+    return "".join(parts) if parts else "Unknown"
+
+
+@lru_cache(maxsize=_KEY_CACHE_SIZE)
+def _state_key(
+    viseme: Optional[str],
+    emotion: Optional[str],
+    state: Optional[str],
+    shape: Optional[str],
+) -> str:
+    """Build a state key from the state-like fields of a tag."""
+    if viseme:
+        return f"viseme/{viseme}"
+    elif emotion:
+        return f"emotion/{emotion}"
+    elif state:
+        return f"state/{state}"
+    elif shape:
+        return f"shape/{shape}"
+    else:
+        return "default"
+
 
 @dataclass
 class PCSTag:
@@ -49,27 +86,12 @@ class PCSTag:
 
     def to_slot_key(self) -> str:
         """Generate a standardized slot key for this tag."""
-        parts = []
-
-        if self.part:
-            parts.append(self.part)
-        if self.side:
-            parts.append(self.side)
-
-        return "".join(parts) if parts else "Unknown"
+        # Tags are mutable, so cache on the field values rather than the instance
+        return _slot_key(self.part, self.side)
 
     def to_state_key(self) -> str:
         """Generate a standardized state key for this tag."""
-        if self.viseme:
-            return f"viseme/{self.viseme}"
-        elif self.emotion:
-            return f"emotion/{self.emotion}"
-        elif self.state:
-            return f"state/{self.state}"
-        elif self.shape:
-            return f"shape/{self.shape}"
-        else:
-            return "default"
+        return _state_key(self.viseme, self.emotion, self.state, self.shape)
 
 
 @dataclass
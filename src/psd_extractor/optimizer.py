@@ -111,6 +111,25 @@ class ImageOptimizer:
             logger.error(f"Failed to resize image: {e}")
             return image
 
+    def needs_optimization(self, image: Image.Image) -> bool:
+        """
+        Check whether optimize_for_web would change the image.
+
+        Args:
+            image: PIL Image to check
+
+        Returns:
+            False if the image already has the target mode and size
+        """
+        if self.format_type == "JPEG":
+            mode_ok = image.mode != "RGBA"
+        elif self.format_type == "PNG":
+            mode_ok = image.mode == "RGBA"
+        else:
+            mode_ok = True
+
+        return not mode_ok or image.size != self.calculate_scaled_size(image)
+
     def optimize_for_web(self, image: Image.Image) -> Image.Image:
         """
         Optimize image for web applications.
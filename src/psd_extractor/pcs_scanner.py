@@ -5,6 +5,7 @@ Scans PSD files and extracts layer information according to the PCS specificatio
 """
 
 import logging
+from collections import Counter
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -186,40 +187,17 @@ class PCSScanner:
         Returns:
             Dictionary containing layer statistics
         """
+        tags = [layer.pcs_tag for layer in layers if layer.pcs_tag]
+
+        # Counter tallies in C; sets are sorted into lists for JSON serialization
         stats = {
             "total_layers": len(layers),
-            "tagged_layers": 0,
-            "groups": {},
-            "parts": {},
-            "visemes": set(),
-            "states": set(),
-            "emotions": set(),
+            "tagged_layers": len(tags),
+            "groups": dict(Counter(tag.group for tag in tags if tag.group)),
+            "parts": dict(Counter(tag.part for tag in tags if tag.part)),
+            "visemes": sorted({tag.viseme for tag in tags if tag.viseme}),
+            "states": sorted({tag.state for tag in tags if tag.state}),
+            "emotions": sorted({tag.emotion for tag in tags if tag.emotion}),
         }
 
-        for layer in layers:
-            if layer.pcs_tag:
-                stats["tagged_layers"] += 1
-
-                if layer.pcs_tag.group:
-                    group = layer.pcs_tag.group
-                    stats["groups"][group] = stats["groups"].get(group, 0) + 1
-
-                if layer.pcs_tag.part:
-                    part = layer.pcs_tag.part
-                    stats["parts"][part] = stats["parts"].get(part, 0) + 1
-
-                if layer.pcs_tag.viseme:
-                    stats["visemes"].add(layer.pcs_tag.viseme)
-
-                if layer.pcs_tag.state:
-                    stats["states"].add(layer.pcs_tag.state)
-
-                if layer.pcs_tag.emotion:
-                    stats["emotions"].add(layer.pcs_tag.emotion)
-
-        # Convert sets to lists for JSON serialization
-        stats["visemes"] = sorted(list(stats["visemes"]))
-        stats["states"] = sorted(list(stats["states"]))
-        stats["emotions"] = sorted(list(stats["emotions"]))
-
         return stats
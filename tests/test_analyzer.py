@@ -114,6 +114,9 @@ class TestPSDAnalyzer(unittest.TestCase):
         not_found = analyzer.get_layer_by_name("NonExistent")
         self.assertIsNone(not_found)
 
+        # Layer tree is only walked once for repeated lookups
+        self.assertEqual(mock_psd.descendants.call_count, 1)
+
     @patch('src.psd_extractor.analyzer.PSDImage')
     def test_get_expression_group(self, mock_psd_image):
         """Test finding expression group layer"""
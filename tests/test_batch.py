@@ -0,0 +1,362 @@
+"""
+Tests for Batch Processor module
+"""
+
+import unittest
+import tempfile
+import json
+import os
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest.mock import patch
+
+from src.psd_extractor.batch import BatchProcessor
+
+
+# Minimal 26-byte headers: signature, version, reserved, channels, height, width,
+# depth and color mode. The size fields contain CR/LF and 0x1A bytes, which a
+# text-mode read would translate or stop at.
+PSD_HEADER = (
+    b"8BPS\x00\x01" + b"\x00" * 6 + b"\x00\x04"
+    + b"\x00\x00\x0d\x0a" + b"\x00\x00\x1a\x0a" + b"\x00\x08\x00\x03"
+)
+PSB_HEADER = b"8BPS\x00\x02" + PSD_HEADER[6:]
+
+
+class TestBatchProcessor(unittest.TestCase):
+    """Test cases for BatchProcessor class"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_dir = Path(self.temp_dir.name)
+        self.processor = BatchProcessor(
+            input_dir=str(self.input_dir), executor_type="thread"
+        )
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.temp_dir.cleanup()
+
+    def _write(self, relative_path, data=PSD_HEADER):
+        """Write a file below the input directory"""
+        path = self.input_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return path
+
+    def test_has_psd_header_valid_psd(self):
+        """Test that a PSD header is accepted"""
+        self.assertEqual(len(PSD_HEADER), BatchProcessor.PSD_HEADER_SIZE)
+        self.assertTrue(self.processor._has_psd_header(self._write("a.psd")))
+
+    def test_has_psd_header_valid_psb(self):
+        """Test that a PSB header is accepted"""
+        self.assertTrue(
+            self.processor._has_psd_header(self._write("a.psb", PSB_HEADER))
+        )
+
+    def test_has_psd_header_truncated_file(self):
+        """Test that a file shorter than the header is rejected"""
+        self.assertFalse(
+            self.processor._has_psd_header(self._write("a.psd", PSD_HEADER[:10]))
+        )
+
+    def test_has_psd_header_not_a_psd(self):
+        """Test that a file with another signature is rejected"""
+        self.assertFalse(
+            self.processor._has_psd_header(self._write("a.psd", b"\x89PNG" + b"\x00" * 30))
+        )
+
+    def test_find_psd_files_top_level_only(self):
+        """Test that subdirectories are not searched by default"""
+        top = self._write("hero.psd")
+        self._write("nested/villain.psd")
+
+        self.assertEqual(self.processor.find_psd_files(), [top])
+
+    def test_find_psd_files_recursive(self):
+        """Test that a recursive search finds files at every depth"""
+        expected = {
+            self._write("hero.psd"),
+            self._write("a/villain.psd"),
+            self._write("a/b/c/sidekick.psd"),
+            self._write("d/extra.psd"),
+        }
+        self._write("a/notes.txt", b"notes")
+
+        found = self.processor.find_psd_files(recursive=True)
+
+        self.assertEqual(len(found), len(expected))
+        self.assertEqual(set(found), expected)
+
+    def test_find_psd_files_matches_psb_and_uppercase_extensions(self):
+        """Test that .psb and upper-case extensions are recognised"""
+        expected = {
+            self._write("hero.PSD"),
+            self._write("large.psb", PSB_HEADER),
+            self._write("LARGE2.PSB", PSB_HEADER),
+        }
+        self._write("image.png", PSD_HEADER)
+
+        self.assertEqual(set(self.processor.find_psd_files()), expected)
+
+    def test_find_psd_files_skips_invalid_headers(self):
+        """Test that files without a PSD header are filtered out"""
+        valid = self._write("hero.psd")
+        self._write("broken.psd", b"not a psd")
+
+        self.assertEqual(self.processor.find_psd_files(), [valid])
+        self.assertEqual(
+            len(self.processor.find_psd_files(validate_headers=False)), 2
+        )
+
+    @patch('src.psd_extractor.batch.CharacterExtractor')
+    def test_extract_batch_rejects_shared_output_directories(self, mock_extractor):
+        """Test that files with the same stem are rejected before extraction"""
+        self._write("a/hero.psd")
+        self._write("b/Hero.psb", PSB_HEADER)
+        psd_files = self.processor.find_psd_files(recursive=True)
+        output_dir = self.input_dir / "out"
+
+        with self.assertRaises(ValueError) as context:
+            self.processor.extract_batch(psd_files, output_dir=str(output_dir))
+
+        self.assertIn("share an output directory", str(context.exception))
+        mock_extractor.assert_not_called()
+        self.assertEqual(list(output_dir.iterdir()), [])
+
+
+class TestBatchResultsStream(unittest.TestCase):
+    """Test cases for streaming extraction results to NDJSON"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.output_dir = root / "out"
+        self.stream_file = root / "results.ndjson"
+        self.psd_paths = []
+        for name in ("hero.psd", "villain.psd"):
+            (root / name).write_bytes(PSD_HEADER)
+            self.psd_paths.append(str(root / name))
+        self.processor = BatchProcessor(
+            input_dir=str(root), output_dir=str(self.output_dir), executor_type="thread"
+        )
+
+        patcher = patch('src.psd_extractor.batch.CharacterExtractor')
+        mock_extractor = patcher.start()
+        self.addCleanup(patcher.stop)
+        mock_instance = mock_extractor.return_value
+        mock_instance.extract_and_save.return_value = {"closed": "closed.png"}
+        mock_instance.get_extraction_summary.return_value = {"total_extractable": 1}
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.temp_dir.cleanup()
+
+    def _read_stream(self):
+        """Read the NDJSON results stream"""
+        lines = self.stream_file.read_text(encoding="utf-8").splitlines()
+        return [json.loads(line) for line in lines]
+
+    def test_results_streamed_and_summaries_dropped(self):
+        """Test that full results go to the stream and summaries stay out of memory"""
+        results = self.processor.extract_batch(
+            self.psd_paths, results_stream=str(self.stream_file)
+        )
+
+        records = self._read_stream()
+        self.assertEqual({r["psd_file"] for r in records}, set(self.psd_paths))
+        for record in records:
+            self.assertTrue(record["success"])
+            self.assertEqual(record["summary"], {"total_extractable": 1})
+
+        self.assertEqual(set(results), set(self.psd_paths))
+        for result in results.values():
+            self.assertTrue(result["success"])
+            self.assertEqual(result["saved_files"], {"closed": "closed.png"})
+            self.assertNotIn("summary", result)
+
+        # The reduced in-memory results are enough for the batch report
+        report = self.processor.generate_batch_report(results)
+        self.assertIn("Successful extractions: 2", report)
+        self.assertIn("hero.psd: 1 expressions extracted", report)
+
+    def test_results_stream_replaced_on_each_run(self):
+        """Test that a second run does not mix its results with the first"""
+        self.processor.extract_batch(
+            self.psd_paths, results_stream=str(self.stream_file)
+        )
+        self.processor.extract_batch(
+            self.psd_paths[:1], results_stream=str(self.stream_file)
+        )
+
+        records = self._read_stream()
+        self.assertEqual([r["psd_file"] for r in records], self.psd_paths[:1])
+
+
+class ScriptedExecutor(Executor):
+    """Executor whose tasks finish with a scripted outcome, in submission order"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.futures = []
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        outcome = self.outcomes.pop(0)
+        if outcome == "run":
+            future.set_result(fn(*args, **kwargs))
+        elif outcome == "cancel":
+            # Real pools notify waiters when they reach a cancelled task
+            future.cancel()
+            future.set_running_or_notify_cancel()
+        elif isinstance(outcome, BaseException):
+            future.set_exception(outcome)
+        # "pending" futures are left unfinished
+        self.futures.append(future)
+        return future
+
+
+def _echo_chunk(psd_paths):
+    """Chunk worker returning a successful result per file"""
+    return {psd_path: {"success": True} for psd_path in psd_paths}
+
+
+class TestBatchRunErrors(unittest.TestCase):
+    """Test cases for pool-level failures while running a batch"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.processor = BatchProcessor(executor_type="thread")
+        self.psd_paths = ["a.psd", "b.psd", "c.psd"]
+
+    def _run(self, outcomes):
+        """Run the batch on a scripted executor"""
+        executor = ScriptedExecutor(outcomes)
+        with patch.object(self.processor, "_create_executor", return_value=executor):
+            results = self.processor._run_batch(_echo_chunk, self.psd_paths, "Testing")
+        return results, executor
+
+    def test_one_task_per_file_for_threads(self):
+        """Test that thread pools get one file per submitted task"""
+        results, executor = self._run(["run", "run", "run"])
+
+        self.assertEqual(len(executor.futures), 3)
+        self.assertEqual(results, {path: {"success": True} for path in self.psd_paths})
+
+    def test_process_pool_chunks_submissions(self):
+        """Test that process pools submit several files per task"""
+        processor = BatchProcessor(executor_type="process", max_workers=1)
+        self.assertEqual(processor._get_chunk_size(3), 1)
+        self.assertEqual(processor._get_chunk_size(40), 10)
+
+    def test_broken_pool_marks_remaining_files_failed(self):
+        """Test that a broken pool keeps finished results and fails the rest"""
+        results, executor = self._run(
+            ["run", BrokenProcessPool("worker died"), "pending"]
+        )
+
+        self.assertEqual(results["a.psd"], {"success": True})
+        self.assertEqual(results["b.psd"], {"error": "worker died"})
+        self.assertEqual(results["c.psd"], {"error": "worker died"})
+        # Unfinished work is cancelled rather than waited for
+        self.assertTrue(executor.futures[2].cancelled())
+
+    def test_cancelled_task_marks_its_files_failed(self):
+        """Test that a cancelled task fails only its own files"""
+        results, _ = self._run(["run", "cancel", "run"])
+
+        self.assertEqual(results["a.psd"], {"success": True})
+        self.assertEqual(results["b.psd"], {"error": "Task cancelled"})
+        self.assertEqual(results["c.psd"], {"success": True})
+
+
+class TestBatchAnalysisCache(unittest.TestCase):
+    """Test cases for the analyze_batch result cache"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.output_dir = root / "out"
+        self.psd_path = root / "hero.psd"
+        self.psd_path.write_bytes(PSD_HEADER)
+        self.cache_file = self.output_dir / BatchProcessor.ANALYSIS_CACHE_FILE
+        self.processor = BatchProcessor(
+            input_dir=str(root), output_dir=str(self.output_dir), executor_type="thread"
+        )
+
+        patcher = patch('src.psd_extractor.batch.PSDAnalyzer')
+        self.mock_analyzer = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_analyzer.return_value.analyze_layer_structure.return_value = {
+            "basic_info": {"width": 100, "height": 100, "size": (100, 100)}
+        }
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.temp_dir.cleanup()
+
+    def _analyze(self):
+        """Run a cached analysis of the test file"""
+        return self.processor.analyze_batch([self.psd_path])[str(self.psd_path)]
+
+    def test_cache_hit_skips_analysis(self):
+        """Test that unchanged files are served from the cache"""
+        fresh = self._analyze()
+        cached = self._analyze()
+
+        self.assertEqual(self.mock_analyzer.call_count, 1)
+        # Fresh results keep their types; cached ones are read back from JSON
+        self.assertEqual(fresh["basic_info"]["size"], (100, 100))
+        self.assertEqual(cached["basic_info"]["size"], [100, 100])
+
+    def test_cache_invalidated_on_mtime_change(self):
+        """Test that a file with a new modification time is analyzed again"""
+        self._analyze()
+        stat = self.psd_path.stat()
+        os.utime(self.psd_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self._analyze()
+
+        self.assertEqual(self.mock_analyzer.call_count, 2)
+
+    def test_cache_invalidated_on_size_change(self):
+        """Test that a file with a new size is analyzed again"""
+        self._analyze()
+        stat = self.psd_path.stat()
+        self.psd_path.write_bytes(PSD_HEADER + b"\x00")
+        os.utime(self.psd_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self._analyze()
+
+        self.assertEqual(self.mock_analyzer.call_count, 2)
+
+    def test_malformed_cache_discarded(self):
+        """Test that malformed cache files are ignored and replaced"""
+        self.output_dir.mkdir()
+        malformed = [
+            "not json",
+            "[1, 2]",
+            json.dumps({"version": BatchProcessor.ANALYSIS_CACHE_VERSION, "entries": []}),
+            json.dumps({
+                "version": BatchProcessor.ANALYSIS_CACHE_VERSION,
+                "entries": {str(self.psd_path): {"analysis": {}}},
+            }),
+            json.dumps({str(self.psd_path): {"signature": [0, 0], "analysis": {}}}),
+        ]
+
+        for count, content in enumerate(malformed, start=1):
+            self.cache_file.write_text(content)
+            result = self._analyze()
+
+            self.assertIn("basic_info", result)
+            self.assertEqual(self.mock_analyzer.call_count, count)
+            saved = json.loads(self.cache_file.read_text())
+            self.assertEqual(saved["version"], BatchProcessor.ANALYSIS_CACHE_VERSION)
+            self.assertIn(str(self.psd_path), saved["entries"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -56,7 +56,7 @@ class TestAnalyzeCommand(unittest.TestCase):
         """Set up test fixtures"""
         self.runner = CliRunner()
 
-    @patch('src.psd_extractor.cli.PSDAnalyzer')
+    @patch('src.psd_extractor.analyzer.PSDAnalyzer')
     def test_analyze_basic(self, mock_analyzer_class):
         """Test basic analysis command"""
         mock_analyzer = Mock()
@@ -69,7 +69,7 @@ class TestAnalyzeCommand(unittest.TestCase):
             mock_analyzer_class.assert_called_once_with(temp_file.name)
             mock_analyzer.print_analysis_report.assert_called_once()
 
-    @patch('src.psd_extractor.cli.PSDAnalyzer')
+    @patch('src.psd_extractor.analyzer.PSDAnalyzer')
     def test_analyze_detailed_with_output(self, mock_analyzer_class):
         """Test detailed analysis with JSON output"""
         mock_analyzer = Mock()
@@ -94,7 +94,7 @@ class TestAnalyzeCommand(unittest.TestCase):
             self.assertEqual(result.exit_code, 0)
             mock_analyzer.analyze_layer_structure.assert_called_once()
 
-    @patch('src.psd_extractor.cli.PSDAnalyzer')
+    @patch('src.psd_extractor.analyzer.PSDAnalyzer')
     def test_analyze_file_not_found(self, mock_analyzer_class):
         """Test analyze command with non-existent file"""
         result = self.runner.invoke(analyze, ['nonexistent.psd'])
@@ -102,7 +102,7 @@ class TestAnalyzeCommand(unittest.TestCase):
         # Should exit with error due to file not found
         self.assertNotEqual(result.exit_code, 0)
 
-    @patch('src.psd_extractor.cli.PSDAnalyzer')
+    @patch('src.psd_extractor.analyzer.PSDAnalyzer')
     def test_analyze_exception_handling(self, mock_analyzer_class):
         """Test analyze command handles exceptions"""
         mock_analyzer_class.side_effect = Exception("Analysis failed")
@@ -121,7 +121,7 @@ class TestExtractCommand(unittest.TestCase):
         """Set up test fixtures"""
         self.runner = CliRunner()
 
-    @patch('src.psd_extractor.cli.CharacterExtractor')
+    @patch('src.psd_extractor.extractor.CharacterExtractor')
     def test_extract_basic(self, mock_extractor_class):
         """Test basic extraction command"""
         mock_extractor = Mock()
@@ -152,7 +152,7 @@ class TestExtractCommand(unittest.TestCase):
             mock_extractor.extract_expressions.assert_called_once()
             mock_extractor.save_expressions.assert_called_once()
 
-    @patch('src.psd_extractor.cli.CharacterExtractor')
+    @patch('src.psd_extractor.extractor.CharacterExtractor')
     def test_extract_with_custom_options(self, mock_extractor_class):
         """Test extraction with custom options"""
         mock_extractor = Mock()
@@ -192,7 +192,7 @@ class TestExtractCommand(unittest.TestCase):
                 prefix='custom'
             )
 
-    @patch('src.psd_extractor.cli.CharacterExtractor')
+    @patch('src.psd_extractor.extractor.CharacterExtractor')
     def test_extract_with_mapping_file(self, mock_extractor_class):
         """Test extraction with custom mapping file"""
         mock_extractor = Mock()
@@ -222,7 +222,7 @@ class TestExtractCommand(unittest.TestCase):
             self.assertEqual(result.exit_code, 0)
             mock_extractor_class.assert_called_once_with(temp_psd.name, custom_mapping)
 
-    @patch('src.psd_extractor.cli.CharacterExtractor')
+    @patch('src.psd_extractor.extractor.CharacterExtractor')
     def test_extract_no_expressions_found(self, mock_extractor_class):
         """Test extraction when no expressions are found"""
         mock_extractor = Mock()
@@ -245,7 +245,7 @@ class TestBatchCommand(unittest.TestCase):
         """Set up test fixtures"""
         self.runner = CliRunner()
 
-    @patch('src.psd_extractor.cli.BatchProcessor')
+    @patch('src.psd_extractor.batch.BatchProcessor')
     def test_batch_basic(self, mock_processor_class):
         """Test basic batch processing"""
         mock_processor = Mock()
@@ -273,10 +273,11 @@ class TestBatchCommand(unittest.TestCase):
                 input_dir=input_dir,
                 output_dir=output_dir,
                 mapping_file=None,
-                max_workers=4
+                max_workers=4,
+                executor_type="process"
             )
 
-    @patch('src.psd_extractor.cli.BatchProcessor')
+    @patch('src.psd_extractor.batch.BatchProcessor')
     def test_batch_with_report(self, mock_processor_class):
         """Test batch processing with report generation"""
         mock_processor = Mock()
@@ -300,7 +301,7 @@ class TestBatchCommand(unittest.TestCase):
             # Check that report was generated
             mock_processor.generate_batch_report.assert_called_once()
 
-    @patch('src.psd_extractor.cli.BatchProcessor')
+    @patch('src.psd_extractor.batch.BatchProcessor')
     def test_batch_no_files_found(self, mock_processor_class):
         """Test batch processing when no PSD files are found"""
         mock_processor = Mock()
@@ -319,6 +320,30 @@ class TestBatchCommand(unittest.TestCase):
             self.assertEqual(result.exit_code, 0)
             self.assertIn("No PSD files found", result.output)
 
+    @patch('src.psd_extractor.batch.BatchProcessor')
+    def test_batch_io_bound_uses_threads(self, mock_processor_class):
+        """Test that --io-bound selects the thread pool executor"""
+        mock_processor = Mock()
+        mock_processor_class.return_value = mock_processor
+
+        mock_psd_files = [Path('test.psd')]
+        mock_processor.find_psd_files.return_value = mock_psd_files
+        mock_processor.extract_batch.return_value = {'test.psd': {'success': True}}
+
+        with tempfile.TemporaryDirectory() as input_dir, \
+             tempfile.TemporaryDirectory() as output_dir:
+
+            result = self.runner.invoke(batch, [
+                input_dir,
+                '--output', output_dir,
+                '--io-bound'
+            ])
+
+            self.assertEqual(result.exit_code, 0)
+            _, kwargs = mock_processor_class.call_args
+            self.assertEqual(kwargs['executor_type'], "thread")
+            mock_processor.extract_batch.assert_called_once_with(mock_psd_files)
+
 
 class TestCreateMappingCommand(unittest.TestCase):
     """Test cases for the create-mapping command"""
@@ -374,7 +399,7 @@ class TestListExpressionsCommand(unittest.TestCase):
         """Set up test fixtures"""
         self.runner = CliRunner()
 
-    @patch('src.psd_extractor.cli.CharacterExtractor')
+    @patch('src.psd_extractor.extractor.CharacterExtractor')
     def test_list_expressions_basic(self, mock_extractor_class):
         """Test basic expression listing"""
         mock_extractor = Mock()
@@ -400,7 +425,7 @@ class TestListExpressionsCommand(unittest.TestCase):
             self.assertIn("Smile", result.output)
             self.assertIn("Shocked", result.output)
 
-    @patch('src.psd_extractor.cli.CharacterExtractor')
+    @patch('src.psd_extractor.extractor.CharacterExtractor')
     def test_list_expressions_none_found(self, mock_extractor_class):
         """Test expression listing when no expressions are found"""
         mock_extractor = Mock()
@@ -5,9 +5,11 @@ Tests for Character Extractor module
 import unittest
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, PropertyMock
 
-from src.psd_extractor.extractor import CharacterExtractor
+from PIL import Image
+
+from src.psd_extractor.extractor import CharacterExtractor, _render_visible
 
 
 class TestCharacterExtractor(unittest.TestCase):
@@ -60,6 +62,30 @@ class TestCharacterExtractor(unittest.TestCase):
 
         self.assertEqual(extractor.expression_mapping, new_mapping)
 
+    @patch('src.psd_extractor.extractor.PSDAnalyzer')
+    @patch('src.psd_extractor.extractor.PSDImage')
+    def test_init_shares_psd_with_analyzer(self, mock_psd_image, mock_analyzer):
+        """Test that the PSD is opened once and shared with the analyzer"""
+        mock_psd = Mock()
+        mock_psd_image.open.return_value = mock_psd
+
+        extractor = CharacterExtractor(self.mock_psd_path)
+
+        mock_psd_image.open.assert_called_once_with(self.mock_psd_path)
+        mock_analyzer.assert_called_once_with(self.mock_psd_path, psd=mock_psd)
+        self.assertEqual(extractor.psd, mock_psd)
+
+    @patch('src.psd_extractor.extractor.PSDAnalyzer')
+    @patch('src.psd_extractor.extractor.PSDImage')
+    def test_init_with_preloaded_psd(self, mock_psd_image, mock_analyzer):
+        """Test that an injected PSD is used without reopening the file"""
+        preloaded_psd = Mock()
+
+        extractor = CharacterExtractor(self.mock_psd_path, psd=preloaded_psd)
+
+        mock_psd_image.open.assert_not_called()
+        self.assertEqual(extractor.psd, preloaded_psd)
+
     @patch('src.psd_extractor.extractor.PSDAnalyzer')
     @patch('src.psd_extractor.extractor.PSDImage')
     def test_get_available_expressions(self, mock_psd_image, mock_analyzer):
@@ -85,6 +111,7 @@ class TestCharacterExtractor(unittest.TestCase):
     def test_extract_expression_success(self, mock_psd_image, mock_analyzer):
         """Test successful single expression extraction"""
         mock_psd = Mock()
+        mock_psd.width, mock_psd.height = 100, 100
         mock_composite_image = Mock()
         mock_psd.composite.return_value = mock_composite_image
         mock_psd_image.open.return_value = mock_psd
@@ -98,15 +125,125 @@ class TestCharacterExtractor(unittest.TestCase):
         mock_target_layer = Mock()
         original_visibility = False
         mock_target_layer.visible = original_visibility
+        mock_target_layer.bbox = (10, 20, 30, 40)
         mock_analyzer_instance.get_layer_by_name.return_value = mock_target_layer
 
         extractor = CharacterExtractor(self.mock_psd_path)
         result = extractor.extract_expression("Smile")
 
-        self.assertEqual(result, mock_composite_image)
+        # Only the expression's area is re-composited over the cached base
+        mock_psd.composite.assert_called_with(
+            viewport=(10, 20, 30, 40), layer_filter=_render_visible
+        )
+        self.assertEqual(result, mock_composite_image.copy.return_value)
+        result.paste.assert_called_once_with(mock_composite_image, (10, 20))
         # Verify layer visibility was restored to original state
         self.assertEqual(mock_target_layer.visible, original_visibility)
 
+    @patch('src.psd_extractor.extractor.PSDAnalyzer')
+    @patch('src.psd_extractor.extractor.PSDImage')
+    def test_extract_expression_reuses_base_composite(self, mock_psd_image, mock_analyzer):
+        """Test that the base is composited once and expression regions pasted onto it"""
+        base = Image.new("RGBA", (8, 8), (0, 0, 255, 255))
+        region = Image.new("RGBA", (2, 2), (255, 0, 0, 255))
+
+        mock_psd = Mock()
+        mock_psd.width, mock_psd.height = 8, 8
+        mock_psd.composite.side_effect = (
+            lambda viewport=None, layer_filter=None: (
+                base if viewport is None else region
+            )
+        )
+        mock_psd_image.open.return_value = mock_psd
+
+        mock_analyzer_instance = mock_analyzer.return_value
+        mock_expression_group = Mock()
+        mock_expression_group._layers = []
+        mock_analyzer_instance.get_expression_group.return_value = mock_expression_group
+
+        mock_layer = Mock()
+        mock_layer.visible = False
+        mock_layer.bbox = (2, 3, 4, 5)
+        mock_analyzer_instance.get_layer_by_name.return_value = mock_layer
+
+        extractor = CharacterExtractor(self.mock_psd_path)
+        first = extractor.extract_expression("Smile")
+        second = extractor.extract_expression("Smile")
+
+        self.assertEqual(first.getpixel((2, 3)), (255, 0, 0, 255))
+        self.assertEqual(first.getpixel((0, 0)), (0, 0, 255, 255))
+        self.assertEqual(second.tobytes(), first.tobytes())
+        # Cached base is not modified by the pasted regions
+        self.assertEqual(base.getpixel((2, 3)), (0, 0, 255, 255))
+        full_composites = [
+            c for c in mock_psd.composite.call_args_list if "viewport" not in c.kwargs
+        ]
+        self.assertEqual(len(full_composites), 1)
+
+    @patch('src.psd_extractor.extractor.PSDAnalyzer')
+    @patch('src.psd_extractor.extractor.PSDImage')
+    def test_extract_expression_bypasses_saved_preview(self, mock_psd_image, mock_analyzer):
+        """Test that expression composites render layers instead of the saved preview"""
+        mock_psd = Mock()
+        mock_psd.width, mock_psd.height = 100, 100
+        mock_psd_image.open.return_value = mock_psd
+
+        mock_analyzer_instance = mock_analyzer.return_value
+        mock_expression_group = Mock()
+        mock_expression_group._layers = []
+        mock_analyzer_instance.get_expression_group.return_value = mock_expression_group
+
+        mock_target_layer = Mock()
+        mock_target_layer.visible = False
+        mock_target_layer.bbox = (10, 20, 30, 40)
+        mock_analyzer_instance.get_layer_by_name.return_value = mock_target_layer
+
+        extractor = CharacterExtractor(self.mock_psd_path)
+        extractor.extract_expression("Smile")
+
+        # psd-tools only skips the merged preview when a layer_filter is given
+        self.assertEqual(mock_psd.composite.call_count, 2)
+        for call in mock_psd.composite.call_args_list:
+            layer_filter = call.kwargs.get("layer_filter")
+            self.assertIsNotNone(layer_filter)
+
+        hidden_layer = Mock()
+        hidden_layer.is_visible.return_value = False
+        self.assertFalse(layer_filter(hidden_layer))
+
+    @patch('src.psd_extractor.extractor.PSDAnalyzer')
+    @patch('src.psd_extractor.extractor.PSDImage')
+    def test_extract_expression_restores_sibling_visibility(self, mock_psd_image, mock_analyzer):
+        """Test that sibling expression layers are hidden while compositing and restored after"""
+        mock_psd = Mock()
+        mock_psd.width, mock_psd.height = 100, 100
+        mock_psd_image.open.return_value = mock_psd
+
+        sibling = Mock()
+        sibling.visible = True
+        mock_target_layer = Mock()
+        mock_target_layer.visible = False
+        mock_target_layer.bbox = (10, 20, 30, 40)
+
+        seen_visibility = []
+        mock_psd.composite.side_effect = lambda **kwargs: seen_visibility.append(
+            (sibling.visible, mock_target_layer.visible)
+        ) or Mock()
+
+        mock_analyzer_instance = mock_analyzer.return_value
+        mock_expression_group = Mock()
+        mock_expression_group._layers = [sibling, mock_target_layer]
+        mock_analyzer_instance.get_expression_group.return_value = mock_expression_group
+        mock_analyzer_instance.get_layer_by_name.return_value = mock_target_layer
+
+        extractor = CharacterExtractor(self.mock_psd_path)
+        extractor.extract_expression("Smile")
+
+        # Base composite has every expression hidden, the region shows only the target
+        self.assertEqual(seen_visibility, [(False, False), (False, True)])
+        self.assertTrue(sibling.visible)
+        self.assertFalse(mock_target_layer.visible)
+
     @patch('src.psd_extractor.extractor.PSDAnalyzer')
     @patch('src.psd_extractor.extractor.PSDImage')
     def test_extract_expression_layer_not_found(self, mock_psd_image, mock_analyzer):
@@ -139,6 +276,8 @@ class TestCharacterExtractor(unittest.TestCase):
 
         mock_layer = Mock()
         mock_layer.visible = False
+        mock_layer.bbox = (0, 0, 0, 0)
+        mock_psd.width, mock_psd.height = 100, 100
         mock_analyzer_instance.get_layer_by_name.return_value = mock_layer
 
         mock_image = Mock()
@@ -157,8 +296,61 @@ class TestCharacterExtractor(unittest.TestCase):
         # Should extract both states
         self.assertIn('closed', expressions)
         self.assertIn('small', expressions)
-        self.assertEqual(expressions['closed'], mock_image)
-        self.assertEqual(expressions['small'], mock_image)
+        self.assertEqual(expressions['closed'], mock_image.copy.return_value)
+        self.assertEqual(expressions['small'], mock_image.copy.return_value)
+
+    @patch('src.psd_extractor.extractor.PSDAnalyzer')
+    @patch('src.psd_extractor.extractor.PSDImage')
+    def test_extract_expressions_shared_name_composited_once(self, mock_psd_image, mock_analyzer):
+        """Test that shared expressions are extracted once and missing layers skipped"""
+        mock_psd_image.open.return_value = Mock()
+        mock_analyzer_instance = mock_analyzer.return_value
+        mock_analyzer_instance.get_expression_group.return_value = Mock(_layers=[])
+        mock_analyzer_instance.get_layer_by_name.side_effect = (
+            lambda name: None if name == 'missing' else Mock()
+        )
+
+        extractor = CharacterExtractor(self.mock_psd_path)
+        extractor.expression_mapping = {
+            'closed': ['normal'],
+            'small': ['missing', 'normal'],
+        }
+
+        image = Mock()
+        with patch.object(
+            extractor, 'extract_expression',
+            side_effect=lambda name: image if name == 'normal' else None
+        ) as mock_extract:
+            expressions = extractor.extract_expressions()
+
+        # 'missing' has no layer, so it is never attempted
+        self.assertEqual([c.args[0] for c in mock_extract.call_args_list], ['normal'])
+        self.assertEqual(expressions['closed'], image)
+        self.assertEqual(expressions['small'], image.copy.return_value)
+
+    @patch('src.psd_extractor.extractor.PSDAnalyzer')
+    @patch('src.psd_extractor.extractor.PSDImage')
+    def test_extract_expressions_by_name_single_pass(self, mock_psd_image, mock_analyzer):
+        """Test that named expressions share one visibility snapshot"""
+        mock_psd_image.open.return_value = Mock()
+
+        sibling = MagicMock()
+        type(sibling).visible = visible = PropertyMock(return_value=True)
+        mock_analyzer.return_value.get_expression_group.return_value = Mock(
+            _layers=[sibling]
+        )
+
+        extractor = CharacterExtractor(self.mock_psd_path)
+        image = Mock()
+        with patch.object(
+            extractor, 'extract_expression',
+            side_effect=lambda name: image if name != 'missing' else None
+        ):
+            extracted = extractor.extract_expressions_by_name(['smile', 'missing', 'sad'])
+
+        self.assertEqual(extracted, {'smile': image, 'sad': image})
+        # Read once, hidden once and restored once for the whole pass
+        self.assertEqual(visible.call_args_list, [(), ((False,),), ((True,),)])
 
     @patch('src.psd_extractor.extractor.PSDAnalyzer')
     @patch('src.psd_extractor.extractor.PSDImage')
@@ -175,6 +367,8 @@ class TestCharacterExtractor(unittest.TestCase):
 
         mock_layer = Mock()
         mock_layer.visible = False
+        mock_layer.bbox = (0, 0, 0, 0)
+        mock_psd.width, mock_psd.height = 100, 100
         mock_analyzer_instance.get_layer_by_name.return_value = mock_layer
 
         mock_image = Mock()
@@ -332,6 +526,27 @@ class TestCharacterExtractorErrorHandling(unittest.TestCase):
             self.assertNotIn('invalid', saved_files)
             self.assertEqual(len(saved_files), 1)
 
+    @patch('src.psd_extractor.extractor.PSDAnalyzer')
+    @patch('src.psd_extractor.extractor.PSDImage')
+    def test_save_expressions_drops_opaque_alpha(self, mock_psd_image, mock_analyzer):
+        """Test that fully opaque images are saved without an alpha channel"""
+        mock_psd_image.open.return_value = Mock()
+
+        extractor = CharacterExtractor("test.psd")
+
+        expressions = {
+            'opaque': Image.new("RGBA", (4, 4), (10, 20, 30, 255)),
+            'transparent': Image.new("RGBA", (4, 4), (10, 20, 30, 0)),
+        }
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            saved_files = extractor.save_expressions(expressions, temp_dir)
+
+            with Image.open(saved_files['opaque']) as opaque:
+                self.assertEqual(opaque.mode, "RGB")
+            with Image.open(saved_files['transparent']) as transparent:
+                self.assertEqual(transparent.mode, "RGBA")
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""
+Tests for Lipsync Pipeline module
+"""
+
+import unittest
+
+from src.psd_extractor.lipsync import LipsyncData, LipsyncPipeline, VisemeFrame, VisemeType
+
+
+class TestLipsyncPipeline(unittest.TestCase):
+    """Test cases for LipsyncPipeline class"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.pipeline = LipsyncPipeline()
+
+    def test_generate_animation_keyframes(self):
+        """Test keyframe generation from viseme frames"""
+        data = LipsyncData(
+            frames=[
+                VisemeFrame(viseme=VisemeType.AI, start_time=0.0, duration=0.1),
+                VisemeFrame(viseme=VisemeType.MBP, start_time=0.1, duration=0.2, confidence=0.5),
+            ],
+            duration=0.3,
+        )
+
+        keyframes = self.pipeline.generate_animation_keyframes(data)
+
+        self.assertEqual(keyframes[1], {
+            "time": 0.1,
+            "duration": 0.2,
+            "viseme": "MBP",
+            "confidence": 0.5,
+            "slot_states": {"Mouth": {"viseme": "MBP"}},
+        })
+
+    def test_keyframes_do_not_share_slot_states(self):
+        """Test that editing one keyframe's slot states leaves the others alone"""
+        data = LipsyncData(
+            frames=[
+                VisemeFrame(viseme=VisemeType.AI, start_time=0.0, duration=0.1),
+                VisemeFrame(viseme=VisemeType.AI, start_time=0.1, duration=0.1),
+            ],
+            duration=0.2,
+        )
+
+        first, second = self.pipeline.generate_animation_keyframes(data)
+        first["slot_states"]["EyeL"] = {"state": "closed"}
+        first["slot_states"]["Mouth"]["viseme"] = "REST"
+
+        self.assertIsNot(first["slot_states"], second["slot_states"])
+        self.assertEqual(second["slot_states"], {"Mouth": {"viseme": "AI"}})
+        later = self.pipeline.generate_animation_keyframes(data)
+        self.assertEqual(later[0]["slot_states"], {"Mouth": {"viseme": "AI"}})
+
+
+if __name__ == '__main__':
+    unittest.main()
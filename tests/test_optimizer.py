@@ -94,6 +94,18 @@ class TestImageOptimizer(unittest.TestCase):
         self.assertEqual(scaled_size[0], 200)  # Calculated width
         self.assertEqual(scaled_size[1], 600)  # Target height
 
+    def test_needs_optimization(self):
+        """Test that already optimal images are not optimized again"""
+        self.assertFalse(
+            self.optimizer.needs_optimization(Image.new("RGBA", (400, 600)))
+        )
+        self.assertTrue(
+            self.optimizer.needs_optimization(Image.new("RGB", (400, 600)))
+        )
+        self.assertTrue(
+            self.optimizer.needs_optimization(Image.new("RGBA", (800, 1200)))
+        )
+
     @patch('src.psd_extractor.optimizer.Image')
     def test_resize_image_success(self, mock_image_class):
         """Test successful image resizing"""